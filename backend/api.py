@@ -1,16 +1,29 @@
 # backend/api.py
 from decimal import Decimal, InvalidOperation
-from datetime import datetime, date
+from datetime import datetime, date, timezone
+import hashlib
+import io
 import os
+import random
+import re
+import secrets
+import shutil
+import tempfile
+from zoneinfo import ZoneInfo
 from flask_migrate import Migrate
 
-from flask import Blueprint, request, jsonify, current_app, abort, send_from_directory
+from flask import Blueprint, request, jsonify, current_app, abort, send_from_directory, make_response, g
 from flask_login import login_required, current_user
-from sqlalchemy import func, desc, and_, or_
-from sqlalchemy.orm import joinedload
+from flask_caching import Cache
+from flask_limiter import Limiter
+from flask_limiter.util import get_remote_address
+from sqlalchemy import func, desc, and_, or_, case, cast, update, insert, select
+from sqlalchemy.orm import Bundle, joinedload, raiseload, selectinload
 from passlib.hash import bcrypt
 from werkzeug.utils import secure_filename
 
+from .profiling import profile_if
+
 # Models
 from database.models import (
     db,
@@ -21,8 +34,6 @@ from database.models import (
     LedgerEntry,
     Transaction,
     AccountNumberSeq,
-    Role,
-    UserRole,
     AccountStatus,
     RequestStatus,
     TxType,
@@ -41,9 +52,33 @@ from database.models import (
     SIPTransaction,
     SGBApplication,
     SGBTransaction,
+    pii_hmac,
 )
 
 api_bp = Blueprint("api", __name__)
+cache = Cache()  # bound in create_app()
+
+def _rate_limit_key():
+    # Per logged-in user, so customers behind one NAT don't share a PIN-guessing budget
+    return f"user:{current_user.get_id()}" if current_user.is_authenticated else get_remote_address()
+
+limiter = Limiter(key_func=_rate_limit_key)  # bound in create_app()
+
+# Ops dashboards poll the PENDING lists; writers invalidate, so the TTL only bounds cross-worker staleness
+LIST_CACHE_TTL = 15
+
+# passlib silently falls back to far slower backends when the bcrypt C extension is missing
+if bcrypt.get_backend() != "bcrypt":
+    raise RuntimeError("passlib is not using the 'bcrypt' C backend; install the bcrypt package")
+
+# IB PINs are 4-6 digits: a high bcrypt cost adds little against a 10^4-10^6 keyspace
+# but costs ~100 ms per check. Passwords keep passlib's default cost.
+PIN_BCRYPT_ROUNDS = 8
+_pin_bcrypt = bcrypt.using(rounds=PIN_BCRYPT_ROUNDS)
+
+# Optional columns, resolved once from the mappers instead of hasattr() per request
+_LE_HAS_MEMO = "memo" in LedgerEntry.__mapper__.columns.keys()
+_AR_HAS_REMARK = "remark" in AccountRequest.__mapper__.columns.keys()
 
 # -----------------------
 # Helpers / Utilities
@@ -51,51 +86,130 @@ api_bp = Blueprint("api", __name__)
 def _json():
     if request.is_json:
         return request.get_json(silent=True) or {}
-    return request.form.to_dict()
+    # Read-only MultiDict; .get() works the same without copying into a dict
+    return request.form
 
 ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "webp", "pdf"}
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
 
 def _allowed_file(filename: str) -> bool:
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def _content_matches(ext: str, head: bytes) -> bool:
+    # Leading magic bytes must agree with the extension we store the file under
+    if ext == "png":
+        return head.startswith(b"\x89PNG\r\n\x1a\n")
+    if ext in ("jpg", "jpeg"):
+        return head.startswith(b"\xff\xd8\xff")
+    if ext == "webp":
+        return head[:4] == b"RIFF" and head[8:12] == b"WEBP"
+    return head.startswith(b"%PDF-")
+
+def _copy_stream(src, dst) -> None:
+    # Large uploads arrive as real temp files, so the kernel can move the bytes (sendfile).
+    # fileno() on a spool would force an in-memory part out to disk first, so spools
+    # (at most UPLOAD_SPOOL_MAX) and file-less streams take the plain copy.
+    fd_in = None
+    if not isinstance(src, tempfile.SpooledTemporaryFile):
+        try:
+            fd_in = src.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            fd_in = None
+    if fd_in is None or not hasattr(os, "sendfile"):
+        shutil.copyfileobj(src, dst, UPLOAD_CHUNK_SIZE)
+        return
+    offset, size = src.tell(), os.fstat(fd_in).st_size
+    while offset < size:
+        sent = os.sendfile(dst.fileno(), fd_in, offset, size - offset)
+        if not sent:
+            break
+        offset += sent
+
+# Directories already created by this process; skips a makedirs() stat per upload/preview
+_READY_DIRS = set()
+
+def _ensure_dir(path: str) -> str:
+    if path not in _READY_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _READY_DIRS.add(path)
+    return path
+
 def _ensure_kyc_root() -> str:
     kyc_root = current_app.config.get("KYC_ROOT")
     if not kyc_root:
         kyc_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "uploads", "kyc"))
-    os.makedirs(kyc_root, exist_ok=True)
-    return kyc_root
+    return _ensure_dir(kyc_root)
 
 def _ensure_loans_root() -> str:
     loans_root = current_app.config.get("LOANS_ROOT")
     if not loans_root:
         loans_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "uploads", "loans"))
-    os.makedirs(loans_root, exist_ok=True)
-    return loans_root
-
-def _save_upload(fileobj, prefix: str, is_loan=False) -> str:
+    return _ensure_dir(loans_root)
+
+def _sha256_of(stream) -> str:
+    if hasattr(hashlib, "file_digest"):  # Python 3.11+: hashed in C straight from the fd
+        return hashlib.file_digest(stream, "sha256").hexdigest()
+    h = hashlib.sha256()
+    while chunk := stream.read(UPLOAD_CHUNK_SIZE):
+        h.update(chunk)
+    return h.hexdigest()
+
+def _store_upload(fileobj, prefix: str, is_loan=False) -> tuple:
+    """Save an upload and return (final_name, sha256 hex); ("", "") when no file was sent."""
     if not fileobj or not fileobj.filename:
-        return ""
+        return "", ""
     if not _allowed_file(fileobj.filename):
         raise ValueError("Only PDF/PNG/JPG/JPEG/WEBP files allowed")
-    fname = secure_filename(fileobj.filename)
-    ts = datetime.now().strftime("%Y%m%d%H%M%S")
-    _, ext = os.path.splitext(fname)
-    final_name = f"{prefix}_{ts}{ext.lower()}"
+    ext = fileobj.filename.rsplit(".", 1)[1].lower()
+    stream = fileobj.stream
+    head = stream.read(512)
+    stream.seek(0)
+    if not _content_matches(ext, head):
+        raise ValueError(f"File content does not look like a .{ext} file")
+    # The client's basename is never used on disk, so it needs no sanitising
+    final_name = f"{prefix}_{secrets.token_hex(8)}.{ext}"
     upload_dir = _ensure_loans_root() if is_loan else _ensure_kyc_root()
-    fileobj.save(os.path.join(upload_dir, final_name))
-    return final_name
+    final_path = os.path.join(upload_dir, final_name)
+    digest = _sha256_of(stream)
+    stream.seek(0)
+    # Content-addressed links: a re-upload of identical bytes is hard-linked, not rewritten
+    blob_path = os.path.join(_ensure_dir(os.path.join(upload_dir, ".sha256")), digest)
+    try:
+        os.link(blob_path, final_path)
+        return final_name, digest
+    except OSError:
+        pass
+    # Copy from the spooled upload without ever holding the whole file
+    with open(final_path, "wb") as out:
+        _copy_stream(stream, out)
+    try:
+        os.link(final_path, blob_path)
+    except OSError:
+        pass
+    return final_name, digest
+
+def _save_upload(fileobj, prefix: str, is_loan=False) -> str:
+    return _store_upload(fileobj, prefix, is_loan=is_loan)[0]
 
 def _get_customer():
-    return Customer.query.filter_by(user_id=current_user.id).first()
+    # Memoized for the request (a missing profile too); code creating the row updates g._cust
+    if "_cust" not in g:
+        g._cust = Customer.query.filter_by(user_id=current_user.id).first()
+    return g._cust
 
 def _first_account_for_user(active_only: bool = False):
+    memo = g.setdefault("_first_acc", {})
+    if active_only in memo:
+        return memo[active_only]
     cust = _get_customer()
-    if not cust:
-        return None
-    q = Account.query.filter_by(customer_id=cust.id)
-    if active_only:
-        q = q.filter(Account.status == AccountStatus.ACTIVE)
-    return q.order_by(Account.created_at.asc()).first()
+    acc = None
+    if cust:
+        q = Account.query.filter_by(customer_id=cust.id)
+        if active_only:
+            q = q.filter(Account.status == AccountStatus.ACTIVE)
+        acc = q.order_by(Account.created_at.asc()).first()
+    memo[active_only] = acc
+    return acc
 
 def _require_any_account(active_only: bool = False):
     acc = _first_account_for_user(active_only=active_only)
@@ -105,20 +219,204 @@ def _require_any_account(active_only: bool = False):
         return None, (jsonify(ok=False, message=msg), 409)
     return acc, None
 
+def _user_role_names() -> frozenset:
+    # Preloaded by the user_loader; only users logged in mid-request lack it
+    names = getattr(current_user, "_role_names", None)
+    if names is None:
+        names = frozenset(ur.role.name for ur in current_user.roles)
+        current_user._role_names = names
+    return names
+
+# Ledger amounts are integer paise (1/100 rupee); rupees only appear at the JSON boundary
+_AMOUNT_RE = re.compile(r"^\d+(\.\d{1,2})?$")
+
+# Income-tax PAN: five letters, four digits, one letter (e.g. ABCDE1234F).
+# ASCII-only on purpose: str.isdigit() also accepts e.g. Devanagari digits.
+_PAN_RE = re.compile(r"[A-Z]{5}[0-9]{4}[A-Z]")
+_AADHAAR_RE = re.compile(r"[0-9]{12}")
+
+def _to_paise(raw) -> int:
+    """Parse a rupee amount such as "125", "125.5" or 125.50 into integer paise."""
+    text_amt = str(raw).strip() if raw is not None else ""
+    if not _AMOUNT_RE.match(text_amt):
+        raise ValueError("invalid amount")
+    rupees, _, frac = text_amt.partition(".")
+    return int(rupees) * 100 + int(frac.ljust(2, "0"))
+
+def _rupees(paise: int) -> float:
+    return paise / 100
+
+def _rupees_row(row, money_keys) -> dict:
+    """Row mapping as a dict, with the paise columns named in money_keys shown in rupees."""
+    d = dict(row._mapping)
+    for k in money_keys:
+        d[k] = _rupees(d[k] or 0)
+    return d
+
+def _display_dt(dt: datetime) -> datetime:
+    """TIMESTAMP columns read back as naive UTC; shift one into DISPLAY_TZ for date/time labels."""
+    return dt.replace(tzinfo=timezone.utc).astimezone(ZoneInfo(current_app.config["DISPLAY_TZ"]))
+
+LIST_PAGE_DEFAULT = 50
+LIST_PAGE_MAX = 200
+
+def _page_params() -> tuple:
+    """(limit, cursor) from ?limit=&cursor=, with limit clamped to 1..LIST_PAGE_MAX."""
+    try:
+        limit = int(request.args.get("limit") or LIST_PAGE_DEFAULT)
+    except ValueError:
+        limit = LIST_PAGE_DEFAULT
+    return max(1, min(limit, LIST_PAGE_MAX)), request.args.get("cursor", "").strip()
+
+def _keyset_page(q, model, limit=None, cursor_raw=None):
+    """Page q newest-first: (q, limit, err); limit/cursor_raw default to _page_params().
+
+    The cursor is the "<created_at ISO>|<id>" a previous page handed out as
+    next_cursor; a bare timestamp pages on created_at alone. Seeking past
+    (created_at, id) keeps deep pages as cheap as the first one, unlike OFFSET.
+    """
+    if limit is None:
+        limit, cursor_raw = _page_params()
+    if cursor_raw:
+        ts_raw, _, id_raw = cursor_raw.partition("|")
+        try:
+            ts = datetime.fromisoformat(ts_raw)
+            last_id = int(id_raw) if id_raw else None
+        except ValueError:
+            return q, limit, (jsonify(ok=False, message="Invalid 'cursor'"), 400)
+        if last_id is None:
+            q = q.filter(model.created_at < ts)
+        else:
+            q = q.filter(or_(model.created_at < ts,
+                             and_(model.created_at == ts, model.id < last_id)))
+    q = q.order_by(model.created_at.desc(), model.id.desc()).limit(limit)
+    return q, limit, None
+
+def _as_text(col):
+    # Numeric -> string in SQL (CAST AS CHAR), so rows carry no Decimal just to str() it
+    return cast(col, db.String).label(col.key)
+
+def _next_cursor(rows, limit):
+    if len(rows) < limit or rows[-1].created_at is None:
+        return None
+    return f"{rows[-1].created_at.isoformat()}|{rows[-1].id}"
+
+def _ledger_balances(account_id=None, lock=False) -> dict:
+    """Re-aggregate balances from the ledger, {account_id: paise}; accounts without entries are absent.
+
+    This is the source of truth Account.balance is reconciled against; request paths read the column.
+    lock=True makes it a locking read, so it sees the latest committed legs rather than the
+    transaction's REPEATABLE READ snapshot.
+    """
+    signed = case((LedgerEntry.dr_cr == "CR", LedgerEntry.amount), else_=-LedgerEntry.amount)
+    q = (db.session.query(LedgerEntry.account_id, func.sum(signed))
+         .filter(LedgerEntry.account_id.isnot(None)))
+    if account_id is not None:
+        q = q.filter(LedgerEntry.account_id == account_id)
+    if lock:
+        q = q.with_for_update(read=True)
+    return {acc_id: int(bal) for acc_id, bal in q.group_by(LedgerEntry.account_id)}
+
+def _reconcile_balances(account_id=None, fix=False) -> list:
+    """Accounts whose stored balance differs from the ledger; with fix=True, correct them (caller commits).
+
+    fix locks the account rows first so no posting lands between the sum and the write, then
+    sums the ledger with a locking read too: both sides are current data. A plain read would
+    use the snapshot taken at the request's first query and miss legs committed since, while
+    FOR UPDATE already sees them in the balance. A check-only run reads one consistent
+    snapshot and blocks nobody.
+    """
+    q = db.session.query(Account).options(raiseload("*"))
+    if account_id is not None:
+        q = q.filter(Account.id == account_id)
+    if fix:
+        q = q.with_for_update()
+    accounts = q.all()
+    sums = _ledger_balances(account_id, lock=fix)
+    drift = []
+    for acc in accounts:
+        ledger_bal = sums.get(acc.id, 0)
+        if acc.balance != ledger_bal:
+            drift.append({"account_id": acc.id, "account_no": acc.account_no,
+                          "was": _rupees(acc.balance), "now": _rupees(ledger_bal)})
+            if fix:
+                acc.balance = ledger_bal
+    return drift
+
+def _account_balance(account_id) -> int:
+    return db.session.execute(select(Account.balance).where(Account.id == account_id)).scalar_one()
+
+def _post_transaction(tx_type, amount: int, debit: dict, credit: dict, check_funds: bool = False):
+    """Insert a POSTED Transaction plus its DR/CR ledger legs; returns the transaction id.
+
+    `debit`/`credit` pick each leg's side ({"account_id": ...} or {"gl_code": ...})
+    and may carry extra LedgerEntry columns. Both legs go out as one multi-row INSERT,
+    and Account.balance of each account leg moves in the same transaction. With
+    check_funds the debit is a conditional UPDATE (balance >= amount); None means it
+    didn't cover `amount` and no ledger rows were written, but the credit leg's balance
+    may already have moved, so the caller must roll back.
+    """
+    acc_t = Account.__table__
+    dr_acct, cr_acct = debit.get("account_id"), credit.get("account_id")
+    legs = []  # (account id, UPDATE, must match a row)
+    if dr_acct is not None:
+        stmt = update(acc_t).where(acc_t.c.id == dr_acct).values(balance=acc_t.c.balance - amount)
+        if check_funds:
+            stmt = stmt.where(acc_t.c.balance >= amount)
+        legs.append((dr_acct, stmt, check_funds))
+    if cr_acct is not None:
+        legs.append((cr_acct, update(acc_t).where(acc_t.c.id == cr_acct).values(balance=acc_t.c.balance + amount),
+                     False))
+    # Row locks in ascending account id, so opposing transfers (A->B, B->A) queue on
+    # the same first row instead of deadlocking; they also serialise concurrent debits
+    for _, stmt, must_match in sorted(legs, key=lambda leg: leg[0]):
+        if db.session.execute(stmt).rowcount == 0 and must_match:
+            return None
+    tx_id = db.session.execute(
+        insert(Transaction.__table__).values(type=tx_type, status=TxStatus.POSTED, created_by=current_user.id)
+    ).inserted_primary_key[0]
+    # Same key set on both rows, otherwise the executemany splits into two statements
+    base = {"transaction_id": tx_id, "account_id": None, "gl_code": None, "amount": amount}
+    db.session.execute(insert(LedgerEntry.__table__), [
+        {**base, **debit, "dr_cr": "DR"},
+        {**base, **credit, "dr_cr": "CR"},
+    ])
+    return tx_id
+
 def _has_role(role_name: str) -> bool:
     if not current_user.is_authenticated:
         return False
-    role = Role.query.filter_by(name=role_name).first()
-    if not role:
-        return False
-    link = UserRole.query.filter_by(user_id=current_user.id, role_id=role.id).first()
-    return link is not None
+    return role_name in _user_role_names()
 
 def _require_employee_or_admin():
     if _has_role("EMPLOYEE") or _has_role("ADMIN"):
         return
     abort(403)
 
+def _decide_pending(model, app_id: int, new_status, not_found_msg: str, **values):
+    """Move a PENDING application to new_status with one conditional UPDATE; returns an error response or None.
+
+    The status check and the write are the same statement, so two reviewers can't both
+    decide a row. Only on a miss is the row read again, to tell 404 from "Already ...".
+    """
+    stmt = (update(model)
+            .where(model.id == app_id, model.status == RequestStatus.PENDING)
+            .values(status=new_status, **values)
+            .execution_options(synchronize_session=False))
+    if db.session.execute(stmt).rowcount:
+        return None
+    current = db.session.execute(select(model.status).where(model.id == app_id)).scalar()
+    if current is None:
+        return jsonify(ok=False, message=not_found_msg), 404
+    return jsonify(ok=False, message=f"Already {current.value}"), 400
+
+def _accel_redirect(internal_uri: str):
+    # Empty body; nginx serves the file from its internal location with sendfile()
+    resp = make_response("")
+    resp.headers["X-Accel-Redirect"] = internal_uri
+    resp.headers["Content-Type"] = ""  # let nginx pick the type from the extension
+    return resp
+
 @api_bp.get("/ping")
 def ping():
     return jsonify(ok=True, message="api alive")
@@ -133,14 +431,11 @@ def employee_file_kyc(filename: str):
     safe_name = secure_filename(os.path.basename(filename))
     if not safe_name:
         return abort(404)
-    kyc_root = _ensure_kyc_root()
-    abs_path = os.path.abspath(os.path.join(kyc_root, safe_name))
-    if not abs_path.startswith(os.path.abspath(kyc_root)):
-        return abort(403)
-    if not os.path.exists(abs_path):
-        return abort(404)
-    directory, fname = os.path.split(abs_path)
-    return send_from_directory(directory, fname)
+    if current_app.config.get("USE_XACCEL"):
+        return _accel_redirect(f"/_protected_kyc/{safe_name}")
+    # secure_filename leaves no separators, so the name can't escape the root;
+    # send_from_directory does the one stat and 404s on a missing file.
+    return send_from_directory(_ensure_kyc_root(), safe_name, conditional=True)
 
 # -----------------------
 # Presence probe
@@ -168,6 +463,7 @@ def customers_init():
     if not cust:
         cust = Customer(user_id=current_user.id, full_name=full_name, phone=phone, address=address)
         db.session.add(cust)
+        g._cust = cust
     else:
         cust.full_name = full_name or cust.full_name
         cust.phone = phone or cust.phone
@@ -193,11 +489,12 @@ def accounts_request():
         cust = Customer(user_id=current_user.id, full_name=full_name_f, phone=mobile_f, address=perm_addr_f)
         db.session.add(cust)
         db.session.flush()
+        g._cust = cust
     try:
         branch_id = int(form.get("branch_id") or 0)
     except Exception:
         return jsonify(ok=False, message="Invalid branch_id"), 400
-    br = Branch.query.get(branch_id)
+    br = db.session.get(Branch, branch_id)
     if not br:
         return jsonify(ok=False, message="Invalid branch_id"), 400
     product = (form.get("product") or "SAVINGS").upper()
@@ -209,7 +506,7 @@ def accounts_request():
     mobile = (form.get("mobile") or "").strip()
     email = (form.get("email") or "").strip()
     aadhaar_no = (form.get("aadhaar_no") or "").strip()
-    pan_no = (form.get("pan_no") or "").strip()
+    pan_no = (form.get("pan_no") or "").strip().upper()
     perm_address = (form.get("perm_address") or "").strip()
     comm_address = (form.get("comm_address") or "").strip()
     occupation_type = (form.get("occupation_type") or "").strip()
@@ -217,9 +514,9 @@ def accounts_request():
     if not (full_name and dob_str and gender and mobile and email and aadhaar_no and pan_no
             and perm_address and occupation_type and annual_income_range):
         return jsonify(ok=False, message="All required fields must be filled"), 400
-    if not aadhaar_no.isdigit() or len(aadhaar_no) != 12:
+    if not _AADHAAR_RE.fullmatch(aadhaar_no):
         return jsonify(ok=False, message="Invalid Aadhaar"), 400
-    if len(pan_no) != 10:
+    if not _PAN_RE.fullmatch(pan_no):
         return jsonify(ok=False, message="Invalid PAN"), 400
     try:
         dob = datetime.strptime(dob_str, "%Y-%m-%d").date()
@@ -235,9 +532,9 @@ def accounts_request():
     if twelfth_birthday > today:
         return jsonify(ok=False, message="Minimum age is 12 years to open an account"), 400
     try:
-        aadhaar_path = _save_upload(files.get("aadhaar_file"), prefix=f"{cust.id}_aadhaar")
-        pan_path = _save_upload(files.get("pan_file"), prefix=f"{cust.id}_pan")
-        photo_path = _save_upload(files.get("photo_file"), prefix=f"{cust.id}_photo") if files.get("photo_file") else ""
+        aadhaar_path, aadhaar_sha = _store_upload(files.get("aadhaar_file"), prefix=f"{cust.id}_aadhaar")
+        pan_path, pan_sha = _store_upload(files.get("pan_file"), prefix=f"{cust.id}_pan")
+        photo_path, photo_sha = _store_upload(files.get("photo_file"), prefix=f"{cust.id}_photo")
     except ValueError as ve:
         return jsonify(ok=False, message=str(ve)), 400
     if not aadhaar_path or not pan_path:
@@ -255,6 +552,8 @@ def accounts_request():
         gender=gender,
         aadhaar_no=aadhaar_no,
         pan_no=pan_no,
+        aadhaar_hmac=pii_hmac(aadhaar_no),
+        pan_hmac=pii_hmac(pan_no),
         perm_address=perm_address,
         comm_address=comm_address or None,
         occupation_type=occupation_type,
@@ -262,6 +561,9 @@ def accounts_request():
         aadhaar_file_path=aadhaar_path,
         pan_file_path=pan_path,
         photo_file_path=photo_path or None,
+        aadhaar_sha256=aadhaar_sha,
+        pan_sha256=pan_sha,
+        photo_sha256=photo_sha or None,
         status=RequestStatus.PENDING,
     )
     db.session.add(ar)
@@ -277,7 +579,7 @@ def accounts_my():
     cust = _get_customer()
     if not cust:
         return jsonify(ok=True, accounts=[])
-    rows = (db.session.query(Account).options(joinedload(Account.branch))
+    rows = (db.session.query(Account).options(joinedload(Account.branch), raiseload("*"))
             .filter(Account.customer_id == cust.id).order_by(Account.created_at.desc()).all())
     out = []
     for a in rows:
@@ -301,14 +603,10 @@ def accounts_my():
 @login_required
 def account_balance(account_id: int):
     cust = _get_customer()
-    acc = Account.query.get(account_id)
+    acc = db.session.get(Account, account_id, options=[raiseload("*")])
     if not acc or not cust or acc.customer_id != cust.id:
         return jsonify(ok=False, message="Account not found"), 404
-    cr = db.session.query(func.coalesce(func.sum(LedgerEntry.amount), 0))\
-        .filter(LedgerEntry.account_id == account_id, LedgerEntry.dr_cr == "CR").scalar()
-    dr = db.session.query(func.coalesce(func.sum(LedgerEntry.amount), 0))\
-        .filter(LedgerEntry.account_id == account_id, LedgerEntry.dr_cr == "DR").scalar()
-    return jsonify(ok=True, balance=float(Decimal(cr) - Decimal(dr)))
+    return jsonify(ok=True, balance=_rupees(acc.balance))
 
 # -----------------------
 # Recent Transactions (paginated)
@@ -318,7 +616,7 @@ def account_balance(account_id: int):
 @login_required
 def account_transactions(account_id: int):
     cust = _get_customer()
-    acc = Account.query.get(account_id)
+    acc = db.session.get(Account, account_id, options=[raiseload("*")])
     if not acc or not cust or acc.customer_id != cust.id:
         return jsonify(ok=False, message="Account not found"), 404
     before_raw = request.args.get("before", "").strip()
@@ -337,28 +635,37 @@ def account_transactions(account_id: int):
                 before_dt = datetime.strptime(before_raw, "%Y-%m-%d")
             except Exception:
                 return jsonify(ok=False, message="Invalid 'before' cursor"), 400
-    q = (db.session.query(LedgerEntry, Transaction)
-         .join(Transaction, Transaction.id == LedgerEntry.transaction_id)
+    # Page through the (account_id, posted_at, id) index; transactions follow in one IN query
+    q = (db.session.query(LedgerEntry)
+         .options(selectinload(LedgerEntry.transaction))
          .filter(LedgerEntry.account_id == account_id))
     if before_dt is not None:
         q = q.filter(LedgerEntry.posted_at < before_dt)
     q = q.order_by(desc(LedgerEntry.posted_at), desc(LedgerEntry.id)).limit(limit)
     rows = q.all()
 
-    def _format_counterparty(le: LedgerEntry):
+    # Counterparty legs for the whole page in one query (first sibling per transaction)
+    sib_by_tx = {}
+    tx_ids = {le.transaction_id for le in rows}
+    if tx_ids:
         sibs = (db.session.query(LedgerEntry)
+                .options(joinedload(LedgerEntry.account))
                 .filter(
-                    LedgerEntry.transaction_id == le.transaction_id,
+                    LedgerEntry.transaction_id.in_(tx_ids),
                     or_(
-                        and_(LedgerEntry.account_id.isnot(None), LedgerEntry.account_id != le.account_id),
+                        and_(LedgerEntry.account_id.isnot(None), LedgerEntry.account_id != account_id),
                         and_(LedgerEntry.account_id.is_(None), LedgerEntry.gl_code.isnot(None))
                     )
                 ).order_by(LedgerEntry.id.asc()).all())
-        if not sibs:
+        for s in sibs:
+            sib_by_tx.setdefault(s.transaction_id, s)
+
+    def _format_counterparty(le: LedgerEntry):
+        s = sib_by_tx.get(le.transaction_id)
+        if s is None:
             return False, "N/A", None, None
-        s = sibs[0]
         if s.account_id:
-            other_acc = Account.query.get(s.account_id)
+            other_acc = s.account
             if other_acc:
                 return True, other_acc.account_no, other_acc.account_no, None
             return True, "Account", None, None
@@ -367,7 +674,8 @@ def account_transactions(account_id: int):
 
     items = []
     next_before = ""
-    for le, tx in rows:
+    for le in rows:
+        tx = le.transaction
         is_acc, cp_label, cp_acc_no, cp_gl = _format_counterparty(le)
         this_acc_no = acc.account_no
         if (le.dr_cr or "").upper() == "CR":
@@ -381,10 +689,11 @@ def account_transactions(account_id: int):
             from_acc_no = this_acc_no
             to_acc_no = cp_acc_no if is_acc else None
         dt = le.posted_at or tx.created_at
-        date_str = dt.strftime("%d/%m/%Y") if dt else ""
-        time_str = dt.strftime("%I:%M %p") if dt else ""
+        local_dt = _display_dt(dt) if dt else None
+        date_str = local_dt.strftime("%d/%m/%Y") if local_dt else ""
+        time_str = local_dt.strftime("%I:%M %p") if local_dt else ""
         items.append({
-            "posted_at": dt.isoformat() if dt else None,
+            "posted_at": dt,
             "date": date_str,
             "time": time_str,
             "type": tx.type.value if hasattr(tx.type, "value") else (tx.type or ""),
@@ -393,12 +702,12 @@ def account_transactions(account_id: int):
             "from_account_no": from_acc_no,
             "to_account_no": to_acc_no,
             "dr_cr": le.dr_cr,
-            "amount": float(le.amount or 0),
+            "amount": _rupees(le.amount or 0),
         })
     if rows:
-        last_dt = rows[-1][0].posted_at or rows[-1][1].created_at
+        last_dt = rows[-1].posted_at or rows[-1].transaction.created_at
         if last_dt:
-            next_before = last_dt.isoformat()
+            next_before = last_dt
     return jsonify(ok=True, items=items, next_before=next_before)
 
 # -----------------------
@@ -411,29 +720,22 @@ def ops_approve_request(req_id: int):
         return jsonify(ok=False, message="EMPLOYEE role required"), 403
     data = _json()
     init_raw = data.get("initial_deposit", 0)
-    init_amt = Decimal(0)
+    init_amt = 0
     if init_raw not in (None, "", 0, "0"):
         try:
-            init_amt = Decimal(str(init_raw))
-        except (InvalidOperation, TypeError):
+            init_amt = _to_paise(init_raw)
+        except ValueError:
             return jsonify(ok=False, message="invalid initial_deposit"), 400
-        if init_amt < 0:
-            return jsonify(ok=False, message="initial_deposit must be >= 0"), 400
-    ar = AccountRequest.query.get(req_id)
+    ar = db.session.get(AccountRequest, req_id,
+                        options=[joinedload(AccountRequest.branch), raiseload("*")])
     if not ar:
         return jsonify(ok=False, message="Request not found"), 404
     if ar.status != RequestStatus.PENDING:
         return jsonify(ok=False, message=f"Request already {ar.status.value}"), 400
-    br = Branch.query.get(ar.branch_id)
+    br = ar.branch
     if not br:
         return jsonify(ok=False, message="Branch not found"), 400
-    seq = AccountNumberSeq.query.filter_by(branch_id=br.id).first()
-    if not seq:
-        seq = AccountNumberSeq(branch_id=br.id, next_serial=1000000001)
-        db.session.add(seq)
-        db.session.flush()
-    serial = int(seq.next_serial)
-    seq.next_serial = serial + 1
+    serial = AccountNumberSeq.next(br.id)
     account_no = f"{br.code}{serial}"
     acc = Account(
         customer_id=ar.customer_id,
@@ -445,15 +747,11 @@ def ops_approve_request(req_id: int):
     db.session.add(acc)
     db.session.flush()
     if init_amt > 0:
-        tx = Transaction(type=TxType.DEPOSIT, status=TxStatus.POSTED, created_by=current_user.id)
-        db.session.add(tx)
-        db.session.flush()
-        db.session.add(LedgerEntry(transaction_id=tx.id, gl_code=GL_CASH_VAULT, dr_cr="DR", amount=init_amt))
-        db.session.add(LedgerEntry(transaction_id=tx.id, account_id=acc.id, dr_cr="CR", amount=init_amt))
+        _post_transaction(TxType.DEPOSIT, init_amt, {"gl_code": GL_CASH_VAULT}, {"account_id": acc.id})
     ar.status = RequestStatus.APPROVED
     db.session.commit()
     return jsonify(ok=True, account_id=acc.id, account_no=acc.account_no,
-                   request_status=ar.status.value, initial_deposit=float(init_amt))
+                   request_status=ar.status.value, initial_deposit=_rupees(init_amt))
 
 # -----------------------
 # EMPLOYEE: Decline account request
@@ -467,13 +765,13 @@ def ops_decline_request(req_id: int):
     remark = (data.get("remark") or "").strip()
     if not remark:
         return jsonify(ok=False, message="Remark is required to decline"), 400
-    ar = AccountRequest.query.get(req_id)
+    ar = db.session.get(AccountRequest, req_id, options=[raiseload("*")])
     if not ar:
         return jsonify(ok=False, message="Request not found"), 404
     if ar.status != RequestStatus.PENDING:
         return jsonify(ok=False, message=f"Request already {ar.status.value}"), 400
     ar.status = RequestStatus.REJECTED
-    if hasattr(ar, "remark"):
+    if _AR_HAS_REMARK:
         ar.remark = remark
     db.session.commit()
     return jsonify(ok=True, status=ar.status.value, message="Request declined with remark")
@@ -486,25 +784,18 @@ def ops_decline_request(req_id: int):
 def ops_get_request(req_id: int):
     if not (_has_role("EMPLOYEE") or _has_role("ADMIN")):
         return jsonify(ok=False, message="EMPLOYEE role required"), 403
-    ar = (db.session.query(
-            AccountRequest,
-            Customer.full_name.label("customer_name"),
-            Branch.code.label("branch_code"),
-        )
-        .join(Customer, Customer.id == AccountRequest.customer_id)
-        .join(Branch, Branch.id == AccountRequest.branch_id)
-        .filter(AccountRequest.id == req_id)
-        .first()
+    a = db.session.get(
+        AccountRequest, req_id,
+        options=[joinedload(AccountRequest.customer), joinedload(AccountRequest.branch), raiseload("*")],
     )
-    if not ar:
+    if not a:
         return jsonify(ok=False, message="Request not found"), 404
-    a, cust_name, br_code = ar
     item = {
         "id": a.id,
         "customer_id": a.customer_id,
-        "customer_name": cust_name,
+        "customer_name": a.customer.full_name,
         "branch_id": a.branch_id,
-        "branch_code": br_code,
+        "branch_code": a.branch.code,
         "product": a.product,
         "status": a.status.value if hasattr(a.status, "value") else a.status,
         "created_at": a.created_at.isoformat() if a.created_at else None,
@@ -514,7 +805,7 @@ def ops_get_request(req_id: int):
         "kyc_photo_path": getattr(a, "kyc_photo_path", None),
         "aadhaar_path": getattr(a, "aadhaar_path", None),
         "pan_path": getattr(a, "pan_path", None),
-        "remark": getattr(a, "remark", None),
+        "remark": a.remark if _AR_HAS_REMARK else None,
     }
     return jsonify(ok=True, item=item)
 
@@ -530,31 +821,23 @@ def ops_post_deposit():
     account_id = data.get("account_id")
     amount_raw = data.get("amount")
     try:
-        amount = Decimal(str(amount_raw))
-    except (InvalidOperation, TypeError):
+        amount = _to_paise(amount_raw)
+    except ValueError:
         return jsonify(ok=False, message="Invalid amount"), 400
     if amount <= 0:
         return jsonify(ok=False, message="Amount must be > 0"), 400
-    acc = Account.query.get(account_id)
+    acc = db.session.get(Account, account_id, options=[raiseload("*")])
     if not acc:
         return jsonify(ok=False, message="Account not found"), 404
     if acc.status != AccountStatus.ACTIVE:
         return jsonify(ok=False, message="Account not active"), 400
-    tx = Transaction(type=TxType.DEPOSIT, status=TxStatus.POSTED, created_by=current_user.id)
-    db.session.add(tx)
-    db.session.flush()
-    db.session.add(LedgerEntry(transaction_id=tx.id, gl_code=GL_CASH_VAULT, dr_cr="DR", amount=amount))
-    db.session.add(LedgerEntry(transaction_id=tx.id, account_id=acc.id, dr_cr="CR", amount=amount))
+    tx_id = _post_transaction(TxType.DEPOSIT, amount, {"gl_code": GL_CASH_VAULT}, {"account_id": acc.id})
+    new_bal = _account_balance(acc.id)
     db.session.commit()
-    cr = db.session.query(func.coalesce(func.sum(LedgerEntry.amount), 0))\
-        .filter(LedgerEntry.account_id == acc.id, LedgerEntry.dr_cr == "CR").scalar()
-    dr = db.session.query(func.coalesce(func.sum(LedgerEntry.amount), 0))\
-        .filter(LedgerEntry.account_id == acc.id, LedgerEntry.dr_cr == "DR").scalar()
-    new_bal = Decimal(cr) - Decimal(dr)
-    receipt_no = f"CD{tx.id:08d}"
-    return jsonify(ok=True, transaction_id=tx.id, account_id=acc.id,
-                   account_no=acc.account_no, posted_amount=float(amount),
-                   new_balance=float(new_bal), receipt_no=receipt_no)
+    receipt_no = f"CD{tx_id:08d}"
+    return jsonify(ok=True, transaction_id=tx_id, account_id=acc.id,
+                   account_no=acc.account_no, posted_amount=_rupees(amount),
+                   new_balance=_rupees(new_bal), receipt_no=receipt_no)
 
 # -----------------------
 # EMPLOYEE: Accept cash deposit (by account_no, teller flow)
@@ -569,8 +852,8 @@ def ops_accept_cash_deposit():
     depositor_name = (data.get("depositor_name") or "").strip()
     teller_note = (data.get("teller_note") or "").strip()
     try:
-        amount = Decimal(str(data.get("amount", "0")))
-    except (InvalidOperation, TypeError):
+        amount = _to_paise(data.get("amount", "0"))
+    except ValueError:
         return jsonify(ok=False, message="Invalid amount"), 400
     if amount <= 0:
         return jsonify(ok=False, message="Amount must be > 0"), 400
@@ -581,27 +864,38 @@ def ops_accept_cash_deposit():
         return jsonify(ok=False, message="Account not found"), 404
     if acc.status != AccountStatus.ACTIVE:
         return jsonify(ok=False, message="Account not active"), 400
-    tx = Transaction(type=TxType.DEPOSIT, status=TxStatus.POSTED, created_by=current_user.id)
-    db.session.add(tx)
-    db.session.flush()
-    db.session.add(LedgerEntry(transaction_id=tx.id, gl_code=GL_CASH_VAULT, dr_cr="DR", amount=amount))
-    le_kwargs = dict(transaction_id=tx.id, account_id=acc.id, dr_cr="CR", amount=amount)
-    if hasattr(LedgerEntry, "memo"):
-        le_kwargs["memo"] = teller_note or (f"Cash deposit by {depositor_name}" if depositor_name else "Cash deposit")
-    db.session.add(LedgerEntry(**le_kwargs))
+    credit = {"account_id": acc.id}
+    if _LE_HAS_MEMO:
+        credit["memo"] = teller_note or (f"Cash deposit by {depositor_name}" if depositor_name else "Cash deposit")
+    tx_id = _post_transaction(TxType.DEPOSIT, amount, {"gl_code": GL_CASH_VAULT}, credit)
+    new_bal = _account_balance(acc.id)
     db.session.commit()
-    cr = db.session.query(func.coalesce(func.sum(LedgerEntry.amount), 0))\
-        .filter(LedgerEntry.account_id == acc.id, LedgerEntry.dr_cr == "CR").scalar()
-    dr = db.session.query(func.coalesce(func.sum(LedgerEntry.amount), 0))\
-        .filter(LedgerEntry.account_id == acc.id, LedgerEntry.dr_cr == "DR").scalar()
-    new_bal = Decimal(cr) - Decimal(dr)
-    receipt_no = f"CD{tx.id:08d}"
-    return jsonify(ok=True, transaction_id=tx.id, account_id=acc.id,
+    receipt_no = f"CD{tx_id:08d}"
+    return jsonify(ok=True, transaction_id=tx_id, account_id=acc.id,
                    account_no=acc.account_no, depositor_name=depositor_name or "",
-                   note=teller_note or "", posted_amount=float(amount),
-                   new_balance=float(new_bal), receipt_no=receipt_no,
+                   note=teller_note or "", posted_amount=_rupees(amount),
+                   new_balance=_rupees(new_bal), receipt_no=receipt_no,
                    message="Cash deposit accepted")
 
+# -----------------------
+# ADMIN: Reconcile Account.balance against the ledger
+# -----------------------
+@api_bp.post("/ops/balances/reconcile")
+@login_required
+def ops_reconcile_balances():
+    if not _has_role("ADMIN"):
+        return jsonify(ok=False, message="ADMIN role required"), 403
+    data = _json()
+    account_id = None
+    if data.get("account_id"):
+        try:
+            account_id = int(data.get("account_id"))
+        except (TypeError, ValueError):
+            return jsonify(ok=False, message="Invalid account_id"), 400
+    fixed = _reconcile_balances(account_id, fix=True)
+    db.session.commit()
+    return jsonify(ok=True, fixed=fixed)
+
 # -----------------------
 # EMPLOYEE: List account requests
 # -----------------------
@@ -611,127 +905,161 @@ def ops_list_requests():
     if not (_has_role("EMPLOYEE") or _has_role("ADMIN")):
         return jsonify(ok=False, message="EMPLOYEE role required"), 403
     status_arg = (request.args.get("status") or "PENDING").upper()
-    q = (db.session.query(AccountRequest, Customer.full_name.label("customer_name"),
-                          Branch.code.label("branch_code"))
-         .join(Customer, Customer.id == AccountRequest.customer_id)
-         .join(Branch, Branch.id == AccountRequest.branch_id)
-         .order_by(AccountRequest.created_at.desc()))
+    # Customer/branch names come in two IN queries; anything else raises
+    q = (db.session.query(AccountRequest)
+         .options(selectinload(AccountRequest.customer), selectinload(AccountRequest.branch),
+                  raiseload("*")))
     if status_arg != "ALL":
         try:
             status_enum = RequestStatus[status_arg]
             q = q.filter(AccountRequest.status == status_enum)
         except KeyError:
             return jsonify(ok=False, message="invalid status"), 400
+    q, limit, err = _keyset_page(q, AccountRequest)
+    if err: return err
+    rows = q.all()
     items = []
-    for ar, cust_name, br_code in q.all():
+    for ar in rows:
         items.append({
             "id": ar.id,
             "customer_id": ar.customer_id,
-            "customer_name": cust_name,
+            "customer_name": ar.customer.full_name,
             "branch_id": ar.branch_id,
-            "branch_code": br_code,
+            "branch_code": ar.branch.code,
             "product": ar.product,
             "status": ar.status.value,
-            "created_at": ar.created_at.isoformat() if ar.created_at else None,
+            "created_at": ar.created_at,
         })
-    return jsonify(ok=True, items=items)
+    return jsonify(ok=True, items=items, next_cursor=_next_cursor(rows, limit))
 
 # =========================
 # Internet Banking (IB)
 # =========================
-def _get_owned_account(acc_no: str = "", acc_id=None):
-    acc = None
-    if acc_no:
-        acc = Account.query.filter_by(account_no=str(acc_no).strip()).first()
-    elif acc_id:
-        try:
-            acc = Account.query.get(int(acc_id))
-        except Exception:
-            acc = None
-    if not acc:
-        return None, (jsonify(ok=False, message="Account not found"), 404)
-    cust = _get_customer()
-    if not cust or acc.customer_id != cust.id:
-        return None, (jsonify(ok=False, message="Not allowed for this account"), 403)
-    return acc, None
+def _on_bcrypt_pool(fn, *args):
+    # Shared by password and PIN hashing, so bursts queue instead of piling onto the CPU
+    return current_app.extensions["bcrypt_pool"].submit(fn, *args).result()
+
+def _hash_pin(pin: str) -> str:
+    return _on_bcrypt_pool(_pin_bcrypt.hash, pin)
+
+def _pin_format_ok(pin: str) -> bool:
+    return pin.isdigit() and len(pin) in (4, 6)
+
+def _verify_pin(ib, pin: str) -> bool:
+    if not _on_bcrypt_pool(ib.verify_pin, pin):
+        return False
+    if _pin_bcrypt.needs_update(ib.pin_hash):
+        # PINs hashed at the old default cost move to PIN_BCRYPT_ROUNDS on first use
+        ib.pin_hash = _hash_pin(pin)
+    return True
+
+def _load_account_bundle(acc_no: str = "", acc_id=None, active_only: bool = True,
+                         ib_entity: bool = True):
+    """Resolve the caller's account, its IB row and ownership in one query: (acc, ib, err).
+
+    Without acc_no/acc_id it falls back to the caller's oldest account, like
+    _require_any_account(). With ib_entity=False only the IB id/pin_hint are
+    selected (an existence probe), so the PIN hash is never loaded.
+    """
+    ib_sel = InternetBanking if ib_entity else \
+        Bundle("ib", InternetBanking.id, InternetBanking.pin_hint)
+    q = (db.session.query(Account, ib_sel, Customer.user_id)
+         .join(Customer, Customer.id == Account.customer_id)
+         .outerjoin(InternetBanking, InternetBanking.account_id == Account.id)
+         .options(raiseload("*")))
+    if acc_no or acc_id:
+        if acc_no:
+            q = q.filter(Account.account_no == str(acc_no).strip())
+        else:
+            try:
+                q = q.filter(Account.id == int(acc_id))
+            except (TypeError, ValueError):
+                return None, None, (jsonify(ok=False, message="Account not found"), 404)
+        row = q.first()
+        if not row:
+            return None, None, (jsonify(ok=False, message="Account not found"), 404)
+        acc, ib, owner_id = row
+        if not ib_entity and ib.id is None:
+            ib = None
+        if owner_id != current_user.id:
+            return None, None, (jsonify(ok=False, message="Not allowed for this account"), 403)
+        return acc, ib, None
+    q = q.filter(Customer.user_id == current_user.id)
+    if active_only:
+        q = q.filter(Account.status == AccountStatus.ACTIVE)
+    row = q.order_by(Account.created_at.asc()).first()
+    if not row:
+        msg = "No active account found. Please open an account first." if active_only \
+              else "No account found. Please open an account first."
+        return None, None, (jsonify(ok=False, message=msg), 409)
+    acc, ib, _ = row
+    if not ib_entity and ib.id is None:
+        ib = None
+    return acc, ib, None
 
 @api_bp.get("/ib/status")
 @login_required
 def ib_status():
-    acc_auto, err_auto = _require_any_account(active_only=False)
-    if err_auto: return err_auto
     acc_no = (request.args.get("account_no") or "").strip()
     acc_id = request.args.get("account_id")
-    acc, err = _get_owned_account(acc_no, acc_id) if (acc_no or acc_id) else (acc_auto, None)
+    acc, ib, err = _load_account_bundle(acc_no, acc_id, active_only=False, ib_entity=False)
     if err: return err
-    ib = InternetBanking.query.filter_by(account_id=acc.id).first()
     return jsonify(ok=True, active=bool(ib), last2=(ib.pin_hint or "") if ib else "")
 
 @api_bp.post("/ib/activate")
 @login_required
 def ib_activate():
-    _, err0 = _require_any_account(active_only=False)
-    if err0: return err0
     data = _json()
     acc_no = (data.get("account_no") or "").strip()
     acc_id = data.get("account_id")
     pin = str(data.get("pin") or "").strip()
-    if not pin.isdigit() or len(pin) not in (4, 6):
+    if not _pin_format_ok(pin):
         return jsonify(ok=False, message="PIN must be 4 or 6 digits"), 400
-    acc = None
-    if acc_no or acc_id:
-        acc, err = _get_owned_account(acc_no, acc_id)
-        if err: return err
-    else:
-        acc, err = _require_any_account(active_only=True)
-        if err: return err
+    acc, ib, err = _load_account_bundle(acc_no, acc_id, ib_entity=False)
+    if err: return err
     if acc.status != AccountStatus.ACTIVE:
         return jsonify(ok=False, message="Account must be ACTIVE to activate IB"), 400
-    ib = InternetBanking.query.filter_by(account_id=acc.id).first()
     if ib: return jsonify(ok=False, message="Internet Banking already activated", active=True), 409
-    ib = InternetBanking(account_id=acc.id, pin_hash=bcrypt.hash(pin), pin_hint=pin[-2:])
+    ib = InternetBanking(account_id=acc.id, pin_hash=_hash_pin(pin), pin_hint=pin[-2:])
     db.session.add(ib); db.session.commit()
     return jsonify(ok=True, message="Internet banking activated", account_id=acc.id, account_no=acc.account_no)
 
 @api_bp.post("/ib/change_pin")
 @login_required
+@limiter.limit("5/minute")
 def ib_change_pin():
-    _, err0 = _require_any_account(active_only=False)
-    if err0: return err0
     data = _json()
     acc_no = (data.get("account_no") or "").strip()
     acc_id = data.get("account_id")
     old_pin = str(data.get("old_pin") or "").strip()
     new_pin = str(data.get("new_pin") or "").strip()
     confirm = str(data.get("confirm_new_pin") or "").strip()
-    if not new_pin.isdigit() or len(new_pin) not in (4,6):
+    if not _pin_format_ok(new_pin):
         return jsonify(ok=False, message="New PIN must be 4 or 6 digits"), 400
     if new_pin != confirm:
         return jsonify(ok=False, message="New PIN and confirm do not match"), 400
-    acc, err = _get_owned_account(acc_no, acc_id) if (acc_no or acc_id) else _require_any_account(active_only=True)
+    acc, ib, err = _load_account_bundle(acc_no, acc_id)
     if err: return err
-    ib = InternetBanking.query.filter_by(account_id=acc.id).first()
     if not ib: return jsonify(ok=False, message="Internet Banking not activated"), 400
-    if not old_pin.isdigit() or not bcrypt.verify(old_pin, ib.pin_hash):
+    # Malformed input never reaches bcrypt
+    if not _pin_format_ok(old_pin) or not _verify_pin(ib, old_pin):
         return jsonify(ok=False, message="Old PIN is incorrect"), 403
-    ib.pin_hash = bcrypt.hash(new_pin); ib.pin_hint = new_pin[-2:]
+    ib.pin_hash = _hash_pin(new_pin); ib.pin_hint = new_pin[-2:]
     db.session.commit()
     return jsonify(ok=True, message="PIN changed successfully")
 
 @api_bp.post("/ib/deactivate")
 @login_required
+@limiter.limit("5/minute")
 def ib_deactivate():
-    _, err0 = _require_any_account(active_only=False)
-    if err0: return err0
     data = _json()
     acc_no = (data.get("account_no") or "").strip()
     acc_id = data.get("account_id")
     pin = str(data.get("pin") or "").strip()
-    acc, err = _get_owned_account(acc_no, acc_id) if (acc_no or acc_id) else _require_any_account(active_only=True)
+    acc, ib, err = _load_account_bundle(acc_no, acc_id)
     if err: return err
-    ib = InternetBanking.query.filter_by(account_id=acc.id).first()
     if not ib: return jsonify(ok=False, message="Internet Banking is not active"), 400
-    if not pin.isdigit() or not bcrypt.verify(pin, ib.pin_hash):
+    if not _pin_format_ok(pin) or not _verify_pin(ib, pin):
         return jsonify(ok=False, message="PIN is incorrect"), 403
     db.session.delete(ib); db.session.commit()
     return jsonify(ok=True, message="Internet Banking deactivated")
@@ -742,21 +1070,21 @@ def ib_deactivate():
 @api_bp.post("/ib/transfer")
 @api_bp.post("/ib/transfer/")
 @login_required
+@limiter.limit("5/minute")
 def ib_transfer():
-    _, err0 = _require_any_account(active_only=False)
-    if err0: return err0
     data = _json()
-    from_acc = None
-    if data.get("from_account_no"):
-        from_acc = Account.query.filter_by(account_no=str(data["from_account_no"]).strip()).first()
-    elif data.get("from_account_id"):
-        try: from_acc = Account.query.get(int(data["from_account_id"]))
-        except Exception: from_acc = None
+    from_acc = ib = None
+    from_no = str(data.get("from_account_no") or "").strip()
+    from_id = data.get("from_account_id")
+    if from_no or from_id:
+        # Source account, its IB row and ownership in one round trip
+        from_acc, ib, err = _load_account_bundle(from_no, from_id)
+        if err and err[1] != 404: return err
     to_acc = None
     if data.get("to_account_no"):
         to_acc = Account.query.filter_by(account_no=str(data["to_account_no"]).strip()).first()
     elif data.get("to_account_id"):
-        try: to_acc = Account.query.get(int(data["to_account_id"]))
+        try: to_acc = db.session.get(Account, int(data["to_account_id"]))
         except Exception: to_acc = None
     if not from_acc or not to_acc:
         return jsonify(ok=False, message="Invalid source or destination account"), 400
@@ -764,41 +1092,29 @@ def ib_transfer():
         return jsonify(ok=False, message="Cannot transfer to the same account"), 400
     if from_acc.status != AccountStatus.ACTIVE or to_acc.status != AccountStatus.ACTIVE:
         return jsonify(ok=False, message="Both accounts must be ACTIVE"), 400
-    cust = _get_customer()
-    if not cust or from_acc.customer_id != cust.id:
-        return jsonify(ok=False, message="Not allowed for this source account"), 403
-    try: amt = Decimal(str(data.get("amount", "0")))
-    except (InvalidOperation, TypeError):
+    try: amt = _to_paise(data.get("amount", "0"))
+    except ValueError:
         return jsonify(ok=False, message="Invalid amount"), 400
     if amt <= 0:
         return jsonify(ok=False, message="Amount must be > 0"), 400
     pin = str(data.get("pin") or "").strip()
-    if not pin.isdigit() or len(pin) not in (4, 6):
+    if not _pin_format_ok(pin):
         return jsonify(ok=False, message="PIN must be 4 or 6 digits"), 400
-    ib = InternetBanking.query.filter_by(account_id=from_acc.id).first()
-    if not ib or not bcrypt.verify(pin, ib.pin_hash):
+    if not ib or not _verify_pin(ib, pin):
         return jsonify(ok=False, message="Invalid PIN or IB not activated"), 403
-    cr = db.session.query(func.coalesce(func.sum(LedgerEntry.amount), 0))\
-        .filter(LedgerEntry.account_id == from_acc.id, LedgerEntry.dr_cr == "CR").scalar()
-    dr = db.session.query(func.coalesce(func.sum(LedgerEntry.amount), 0))\
-        .filter(LedgerEntry.account_id == from_acc.id, LedgerEntry.dr_cr == "DR").scalar()
-    bal = Decimal(cr) - Decimal(dr)
-    if bal < amt:
-        return jsonify(ok=False, message="Insufficient funds", balance=float(bal)), 400
-    tx = Transaction(type=TxType.TRANSFER, status=TxStatus.POSTED, created_by=current_user.id)
-    db.session.add(tx); db.session.flush()
-    db.session.add(LedgerEntry(transaction_id=tx.id, account_id=from_acc.id, dr_cr="DR", amount=amt))
-    db.session.add(LedgerEntry(transaction_id=tx.id, account_id=to_acc.id, dr_cr="CR", amount=amt))
+    # Funds check is the debit UPDATE itself: no read-then-write window
+    tx_id = _post_transaction(TxType.TRANSFER, amt, {"account_id": from_acc.id}, {"account_id": to_acc.id},
+                              check_funds=True)
+    if tx_id is None:
+        bal = _account_balance(from_acc.id)
+        db.session.rollback()
+        return jsonify(ok=False, message="Insufficient funds", balance=_rupees(bal)), 400
+    new_bal = _account_balance(from_acc.id)
     db.session.commit()
-    cr2 = db.session.query(func.coalesce(func.sum(LedgerEntry.amount), 0))\
-        .filter(LedgerEntry.account_id == from_acc.id, LedgerEntry.dr_cr == "CR").scalar()
-    dr2 = db.session.query(func.coalesce(func.sum(LedgerEntry.amount), 0))\
-        .filter(LedgerEntry.account_id == from_acc.id, LedgerEntry.dr_cr == "DR").scalar()
-    new_bal = Decimal(cr2) - Decimal(dr2)
-    return jsonify(ok=True, transaction_id=tx.id,
+    return jsonify(ok=True, transaction_id=tx_id,
                    from_account_id=from_acc.id, from_account_no=from_acc.account_no,
                    to_account_id=to_acc.id, to_account_no=to_acc.account_no,
-                   amount=float(amt), new_balance=float(new_bal), message="Transfer posted")
+                   amount=_rupees(amt), new_balance=_rupees(new_bal), message="Transfer posted")
 
 # =========================
 # Loan APIs
@@ -822,14 +1138,14 @@ def loans_apply():
     purpose = (data.get("purpose") or "").strip()
 
     # New fields stored in LoanApplication
-    pan_no = (data.get("pan_no") or "").strip()
+    pan_no = (data.get("pan_no") or "").strip().upper()
     aadhaar_no = (data.get("aadhaar_no") or "").strip()
     occupation = (data.get("occupation") or "").strip()
 
     # Validate
-    if pan_no and len(pan_no) != 10:
+    if pan_no and not _PAN_RE.fullmatch(pan_no):
         return jsonify(ok=False, message="Invalid PAN"), 400
-    if aadhaar_no and (not aadhaar_no.isdigit() or len(aadhaar_no) != 12):
+    if aadhaar_no and not _AADHAAR_RE.fullmatch(aadhaar_no):
         return jsonify(ok=False, message="Invalid Aadhaar"), 400
 
     tenure_months = int(data.get("tenure_months") or 12)
@@ -837,8 +1153,8 @@ def loans_apply():
     monthly_income_raw = data.get("monthly_income")
 
     try:
-        amount = Decimal(str(amount_raw))
-    except (InvalidOperation, TypeError):
+        amount = _to_paise(amount_raw)
+    except ValueError:
         return jsonify(ok=False, message="Invalid amount"), 400
     if amount <= 0:
         return jsonify(ok=False, message="Amount must be > 0"), 400
@@ -852,6 +1168,19 @@ def loans_apply():
         except (InvalidOperation, TypeError):
             return jsonify(ok=False, message="Invalid monthly_income"), 400
 
+    # Store uploaded documents first so a bad file fails before anything is written
+    docs = []
+    for field, fileobj in files.items():
+        if not fileobj or not fileobj.filename:
+            continue
+        original = secure_filename(fileobj.filename)
+        try:
+            saved = _save_upload(fileobj, prefix=f"loan_{cust.id}_{field}", is_loan=True)
+        except ValueError as ve:
+            return jsonify(ok=False, message=str(ve)), 400
+        if saved:
+            docs.append({"doc_type": field.upper(), "file_name": original, "file_path": saved})
+
     # Create LoanApplication (master record)
     loan_app = LoanApplication(
         customer_id=cust.id,
@@ -860,42 +1189,23 @@ def loans_apply():
         purpose=purpose,
         pan_num=pan_no,
         aadhaar_no=aadhaar_no,
+        pan_hmac=pii_hmac(pan_no),
+        aadhaar_hmac=pii_hmac(aadhaar_no),
         occupation=occupation,
         status=RequestStatus.PENDING,
     )
     db.session.add(loan_app)
     db.session.flush()
 
-    # LoanApplicationDetail (single row)
-    lad = LoanApplicationDetail.query.filter_by(application_id=loan_app.id).first()
-    if not lad:
-        lad = LoanApplicationDetail(application_id=loan_app.id)
-        db.session.add(lad)
-    lad.tenure_months = tenure_months
-    lad.purpose = purpose or lad.purpose
-    lad.monthly_income = monthly_income
-    lad.employment_type = employment_type
-    lad.stage = "SUBMITTED"
-
-    # Handle uploaded documents
-    for field, fileobj in files.items():
-        if not fileobj or not fileobj.filename:
-            continue
-        original = secure_filename(fileobj.filename)
-        try:
-            saved = _save_upload(fileobj, prefix=f"loan_{cust.id}_{field}", is_loan=True)
-        except ValueError as ve:
-            return jsonify(ok=False, message=str(ve)), 400
-        if saved:
-            doc = LoanApplicationDoc(
-                application_id=loan_app.id,
-                doc_type=field.upper(),
-                file_name=original,
-                file_path=saved,
-            )
-            db.session.add(doc)
-
-    # History
+    # LoanApplicationDetail (single row) and history
+    lad = LoanApplicationDetail(
+        application_id=loan_app.id,
+        tenure_months=tenure_months,
+        purpose=purpose or None,
+        monthly_income=monthly_income,
+        employment_type=employment_type,
+        stage="SUBMITTED",
+    )
     hist = LoanAppHistory(
         application_id=loan_app.id,
         from_stage=None,
@@ -903,9 +1213,14 @@ def loans_apply():
         remarks="Application submitted",
         actor_user_id=current_user.id,
     )
-    db.session.add(hist)
+    db.session.add_all([lad, hist])
+    # Document rows need no ids back, so they go out as one executemany
+    if docs:
+        db.session.execute(insert(LoanApplicationDoc.__table__),
+                           [{"application_id": loan_app.id, **d} for d in docs])
 
     db.session.commit()
+    cache.delete_memoized(_loans_first_page)
     return jsonify(ok=True, loan_app_id=loan_app.id, status=loan_app.status.value,
                    message="Loan application submitted")
 
@@ -929,7 +1244,7 @@ def loans_my():
     for a in apps:
         items.append({
             "id": a.id,
-            "amount": str(a.amount),
+            "amount": _rupees(a.amount),
             "product": a.product,
             "purpose": a.purpose,
             "status": a.status.value if a.status else "PENDING",
@@ -948,28 +1263,44 @@ def loans_my():
 def ops_loans_list():
     _require_employee_or_admin()
     status_arg = (request.args.get("status") or "PENDING").upper()
-    q = (db.session.query(LoanApplication, Customer.full_name.label("customer_name"))
-         .join(Customer, Customer.id == LoanApplication.customer_id)
-         .order_by(LoanApplication.created_at.desc()))
+    if status_arg != "ALL" and status_arg not in RequestStatus.__members__:
+        return jsonify(ok=False, message="invalid status"), 400
+    # The queue screen polls the first page; only that one is cached
+    limit, cursor = _page_params()
+    if cursor:
+        items, next_cursor, err = _loans_page(status_arg, limit, cursor)
+    else:
+        items, next_cursor, err = _loans_first_page(status_arg, limit)
+    if err: return err
+    return jsonify(ok=True, items=items, next_cursor=next_cursor)
+
+@cache.memoize(timeout=LIST_CACHE_TTL)
+def _loans_first_page(status_arg: str, limit: int) -> tuple:
+    return _loans_page(status_arg, limit, "")
+
+def _loans_page(status_arg: str, limit: int, cursor: str) -> tuple:
+    """One keyset page of loan applications after `cursor`: (items, next_cursor, err)."""
+    # Applicant name rides along in the same SELECT; nothing else of Customer is loaded
+    q = (db.session.query(LoanApplication)
+         .options(joinedload(LoanApplication.customer).load_only(Customer.full_name), raiseload("*")))
     if status_arg != "ALL":
-        try:
-            status_enum = RequestStatus[status_arg]
-            q = q.filter(LoanApplication.status == status_enum)
-        except KeyError:
-            return jsonify(ok=False, message="invalid status"), 400
+        q = q.filter(LoanApplication.status == RequestStatus[status_arg])
+    q, limit, err = _keyset_page(q, LoanApplication, limit, cursor)
+    if err: return None, None, err
+    rows = q.all()
     items = []
-    for app, cust_name in q.all():
+    for app in rows:
         items.append({
             "id": app.id,
             "customer_id": app.customer_id,
-            "customer_name": cust_name,
-            "amount": float(app.amount),
+            "customer_name": app.customer.full_name,
+            "amount": _rupees(app.amount),
             "product": app.product,
             "purpose": app.purpose,
             "status": app.status.value,
             "created_at": app.created_at.isoformat() if app.created_at else None,
         })
-    return jsonify(ok=True, items=items)
+    return items, _next_cursor(rows, limit), None
 
 
 # -----------------------
@@ -979,19 +1310,21 @@ def ops_loans_list():
 @login_required
 def ops_loan_application_detail(loan_app_id: int):
     _require_employee_or_admin()
-    app = LoanApplication.query.get(loan_app_id)
+    # Application, applicant and detail row in one join; documents in a second query
+    app = db.session.get(
+        LoanApplication, loan_app_id,
+        options=[joinedload(LoanApplication.customer), joinedload(LoanApplication.detail),
+                 selectinload(LoanApplication.docs), raiseload("*")],
+    )
     if not app:
         return jsonify(ok=False, message="Loan application not found"), 404
-
-    cust = Customer.query.get(app.customer_id)
-    lad = LoanApplicationDetail.query.filter_by(application_id=app.id).first()
-    docs = LoanApplicationDoc.query.filter_by(application_id=app.id).all()
+    lad, docs = app.detail, app.docs
 
     return jsonify({
         "ok": True,
         "id": app.id,
-        "customer_name": cust.full_name if cust else "",
-        "amount": float(app.amount),
+        "customer_name": app.customer.full_name if app.customer else "",
+        "amount": _rupees(app.amount),
         "product": app.product,
         "purpose": app.purpose,
         "status": app.status.value,
@@ -1023,17 +1356,16 @@ def ops_loan_approve(loan_app_id: int):
     rate_pa = Decimal(str(data.get("rate_pa") or "10.0"))
     term_months = int(data.get("term_months") or 12)
 
-    app = LoanApplication.query.get(loan_app_id)
+    app = db.session.get(LoanApplication, loan_app_id, options=[joinedload(LoanApplication.detail)])
     if not app: return jsonify(ok=False, message="Loan application not found"), 404
     if app.status != RequestStatus.PENDING:
         return jsonify(ok=False, message=f"Already {app.status.value}"), 400
 
     app.status = RequestStatus.APPROVED
 
-    lad = LoanApplicationDetail.query.filter_by(application_id=app.id).first()
+    lad = app.detail
     if not lad:
-        lad = LoanApplicationDetail(application_id=app.id)
-        db.session.add(lad)
+        lad = app.detail = LoanApplicationDetail(application_id=app.id)
     lad.rate_pa = rate_pa
     lad.tenure_months = term_months
     lad.stage = "APPROVED"
@@ -1050,6 +1382,7 @@ def ops_loan_approve(loan_app_id: int):
                 rate_pa=rate_pa, term_months=term_months)
     db.session.add(loan)
     db.session.commit()
+    cache.delete_memoized(_loans_first_page)
     return jsonify(ok=True, loan_app_id=app.id, loan_id=loan.id,
                    message="Loan approved", status=app.status.value)
 
@@ -1066,13 +1399,13 @@ def ops_loan_decline(loan_app_id: int):
     remark = (data.get("remark") or "").strip()
     if not remark:
         return jsonify(ok=False, message="Remark is required"), 400
-    app = LoanApplication.query.get(loan_app_id)
+    app = db.session.get(LoanApplication, loan_app_id, options=[joinedload(LoanApplication.detail)])
     if not app: return jsonify(ok=False, message="Loan application not found"), 404
     if app.status != RequestStatus.PENDING:
         return jsonify(ok=False, message=f"Already {app.status.value}"), 400
     app.status = RequestStatus.REJECTED
 
-    lad = LoanApplicationDetail.query.filter_by(application_id=app.id).first()
+    lad = app.detail
     if lad: lad.stage = "REJECTED"
 
     db.session.add(LoanAppHistory(
@@ -1083,6 +1416,7 @@ def ops_loan_decline(loan_app_id: int):
         actor_user_id=current_user.id
     ))
     db.session.commit()
+    cache.delete_memoized(_loans_first_page)
     return jsonify(ok=True, loan_app_id=app.id, status=app.status.value,
                    message="Loan declined")
 
@@ -1110,8 +1444,8 @@ def ops_loan_disburse(loan_app_id: int):
     except (TypeError, ValueError):
         return jsonify(ok=False, message="Invalid term (months)"), 400
 
-    # Validate application
-    app = LoanApplication.query.get(loan_app_id)
+    # Validate application (detail row comes along for the stage update)
+    app = db.session.get(LoanApplication, loan_app_id, options=[joinedload(LoanApplication.detail)])
     if not app:
         return jsonify(ok=False, message="Loan application not found"), 404
     if app.status != RequestStatus.APPROVED:
@@ -1126,22 +1460,17 @@ def ops_loan_disburse(loan_app_id: int):
 
     # Amount
     try:
-        disburse_amount = Decimal(str(disburse_amount_raw or app.amount))
-    except (InvalidOperation, TypeError):
+        disburse_amount = _to_paise(disburse_amount_raw) if disburse_amount_raw else app.amount
+    except ValueError:
         return jsonify(ok=False, message="Invalid disburse amount"), 400
     if disburse_amount <= 0:
         return jsonify(ok=False, message="Disburse amount must be > 0"), 400
 
     # Transaction
-    tx = Transaction(type=TxType.LOAN_DISBURSAL, status=TxStatus.POSTED, created_by=current_user.id)
-    db.session.add(tx); db.session.flush()
-
-    db.session.add(LedgerEntry(transaction_id=tx.id, gl_code=GL_BANK_LOAN, dr_cr="DR", amount=disburse_amount))
-    db.session.add(LedgerEntry(transaction_id=tx.id, account_id=acc.id, dr_cr="CR", amount=disburse_amount))
-    # 👆 removed "memo" argument
+    _post_transaction(TxType.LOAN_DISBURSAL, disburse_amount, {"gl_code": GL_BANK_LOAN}, {"account_id": acc.id})
 
     # Update loan detail
-    lad = LoanApplicationDetail.query.filter_by(application_id=app.id).first()
+    lad = app.detail
     if lad:
         lad.rate_pa = rate_pa
         lad.tenure_months = term_months
@@ -1156,8 +1485,9 @@ def ops_loan_disburse(loan_app_id: int):
     ))
 
     db.session.commit()
+    cache.delete_memoized(_loans_first_page)
     return jsonify(ok=True, loan_app_id=app.id, account_id=acc.id,
-                   account_no=acc.account_no, disbursed_amount=float(disburse_amount),
+                   account_no=acc.account_no, disbursed_amount=_rupees(disburse_amount),
                    message="Loan amount disbursed successfully")
 
 
@@ -1169,7 +1499,7 @@ def ops_loan_disburse(loan_app_id: int):
 @login_required
 def loan_status(loan_app_id: int):
     cust = _get_customer()
-    app = LoanApplication.query.get(loan_app_id)
+    app = db.session.get(LoanApplication, loan_app_id)
     if not app or not cust or app.customer_id != cust.id:
         return jsonify(ok=False, message="Loan application not found"), 404
     return jsonify(ok=True, loan_app_id=app.id, status=app.status.value)
@@ -1197,14 +1527,9 @@ def employee_file_loan(filename: str):
     safe_name = secure_filename(os.path.basename(filename))
     if not safe_name:
         return abort(404)
-    loan_root = _ensure_loans_root()
-    abs_path = os.path.abspath(os.path.join(loan_root, safe_name))
-    if not abs_path.startswith(os.path.abspath(loan_root)):
-        return abort(403)
-    if not os.path.exists(abs_path):
-        return abort(404)
-    directory, fname = os.path.split(abs_path)
-    return send_from_directory(directory, fname)
+    if current_app.config.get("USE_XACCEL"):
+        return _accel_redirect(f"/_protected_loans/{safe_name}")
+    return send_from_directory(_ensure_loans_root(), safe_name, conditional=True)
 
 
 # =========================
@@ -1257,6 +1582,7 @@ def credit_cards_apply():
 
     db.session.add(app)
     db.session.commit()
+    cache.delete_memoized(_credit_cards_first_page)
 
     return jsonify(
         ok=True,
@@ -1303,35 +1629,61 @@ def credit_cards_my():
 def ops_credit_cards_list():
     _require_employee_or_admin()
     status_arg = (request.args.get("status") or "PENDING").upper()
+    if status_arg != "ALL" and status_arg not in RequestStatus.__members__:
+        return jsonify(ok=False, message="invalid status"), 400
+    # The queue screen polls the first page; only that one is cached
+    limit, cursor = _page_params()
+    if cursor:
+        items, next_cursor, err = _credit_cards_page(status_arg, limit, cursor)
+    else:
+        items, next_cursor, err = _credit_cards_first_page(status_arg, limit)
+    if err: return err
+    return jsonify(ok=True, items=items, next_cursor=next_cursor)
 
-    q = (db.session.query(CreditCardApplication, Customer.full_name.label("customer_name"))
-         .join(Customer, Customer.id == CreditCardApplication.customer_id)
-         .order_by(CreditCardApplication.created_at.desc()))
+@cache.memoize(timeout=LIST_CACHE_TTL)
+def _credit_cards_first_page(status_arg: str, limit: int) -> tuple:
+    return _credit_cards_page(status_arg, limit, "")
+
+def _credit_cards_page(status_arg: str, limit: int, cursor: str) -> tuple:
+    """One keyset page of credit card applications after `cursor`: (items, next_cursor, err)."""
+    q = (db.session.query(CreditCardApplication)
+         .options(joinedload(CreditCardApplication.customer).load_only(Customer.full_name), raiseload("*")))
 
     if status_arg != "ALL":
-        try:
-            status_enum = RequestStatus[status_arg]
-            q = q.filter(CreditCardApplication.status == status_enum)
-        except KeyError:
-            return jsonify(ok=False, message="invalid status"), 400
+        q = q.filter(CreditCardApplication.status == RequestStatus[status_arg])
 
-    items = []
-    for app, cust_name in q.all():
-        items.append({
-            "id": app.id,
-            "customer_id": app.customer_id,
-            "customer_name": cust_name,
-            "account_no": app.account_no,
-            "card_type": app.card_type,
-            "preferred_limit": str(app.preferred_limit),
-            "status": app.status.value,
-            "created_at": app.created_at.isoformat() if app.created_at else None,
-            # include KYC/document file paths so employee UI can preview
-            "pan_file_path": getattr(app, "pan_file_path", None),
-            "aadhaar_file_path": getattr(app, "aadhaar_file_path", None),
-        })
+    q, limit, err = _keyset_page(q, CreditCardApplication, limit, cursor)
+    if err: return None, None, err
+    rows = q.all()
+    return [_credit_card_item(app) for app in rows], _next_cursor(rows, limit), None
 
-    return jsonify(ok=True, items=items)
+def _credit_card_item(app) -> dict:
+    return {
+        "id": app.id,
+        "customer_id": app.customer_id,
+        "customer_name": app.customer.full_name,
+        "account_no": app.account_no,
+        "card_type": app.card_type,
+        "preferred_limit": str(app.preferred_limit),
+        "status": app.status.value,
+        "created_at": app.created_at.isoformat() if app.created_at else None,
+        # include KYC/document file paths so employee UI can preview
+        "pan_file_path": getattr(app, "pan_file_path", None),
+        "aadhaar_file_path": getattr(app, "aadhaar_file_path", None),
+    }
+
+
+# -----------------------
+# Employee: Get Single Credit Card Application
+# -----------------------
+@api_bp.get("/ops/credit_cards/<int:cc_app_id>")
+@login_required
+def ops_credit_card_get(cc_app_id: int):
+    _require_employee_or_admin()
+    app = db.session.get(CreditCardApplication, cc_app_id, options=[joinedload(CreditCardApplication.customer)])
+    if not app:
+        return jsonify(ok=False, message="Application not found"), 404
+    return jsonify(ok=True, cc_app=_credit_card_item(app))
 
 
 # -----------------------
@@ -1341,7 +1693,7 @@ def ops_credit_cards_list():
 @login_required
 def ops_credit_card_approve(cc_app_id: int):
     _require_employee_or_admin()
-    app = CreditCardApplication.query.get(cc_app_id)
+    app = db.session.get(CreditCardApplication, cc_app_id)
     if not app:
         return jsonify(ok=False, message="Application not found"), 404
     if app.status != RequestStatus.PENDING:
@@ -1349,6 +1701,7 @@ def ops_credit_card_approve(cc_app_id: int):
 
     app.status = RequestStatus.APPROVED
     db.session.commit()
+    cache.delete_memoized(_credit_cards_first_page)
     return jsonify(ok=True, credit_card_app_id=app.id, status=app.status.value, message="Credit Card approved")
 
 
@@ -1363,7 +1716,7 @@ def ops_credit_card_decline(cc_app_id: int):
     remark = (data.get("remark") or "").strip()
     if not remark:
         return jsonify(ok=False, message="Remark required"), 400
-    app = CreditCardApplication.query.get(cc_app_id)
+    app = db.session.get(CreditCardApplication, cc_app_id)
     if not app:
         return jsonify(ok=False, message="Application not found"), 404
     if app.status != RequestStatus.PENDING:
@@ -1371,6 +1724,7 @@ def ops_credit_card_decline(cc_app_id: int):
 
     app.status = RequestStatus.REJECTED
     db.session.commit()
+    cache.delete_memoized(_credit_cards_first_page)
     return jsonify(ok=True, credit_card_app_id=app.id, status=app.status.value, message="Credit Card declined")
 
 
@@ -1442,23 +1796,19 @@ def debit_cards_my():
     if not cust:
         return jsonify(ok=False, message="Customer profile not found"), 404
 
-    apps = (db.session.query(DebitCardApplication)
-            .filter_by(customer_id=cust.id)
-            .order_by(DebitCardApplication.created_at.desc())
-            .all())
+    # Plain column rows shaped like the response: no ORM instances, no per-field formatting
+    q = (db.session.query(DebitCardApplication.id, DebitCardApplication.account_no,
+                          DebitCardApplication.card_type, _as_text(DebitCardApplication.preferred_limit),
+                          DebitCardApplication.status, DebitCardApplication.created_at)
+         .filter(DebitCardApplication.customer_id == cust.id))
+    q, limit, err = _keyset_page(q, DebitCardApplication)
+    if err: return err
+    apps = q.all()
 
-    items = []
-    for a in apps:
-        items.append({
-            "id": a.id,
-            "account_no": a.account_no,
-            "card_type": a.card_type,
-            "preferred_limit": str(a.preferred_limit),
-            "status": a.status.value if a.status else "PENDING",
-            "created_at": a.created_at.isoformat() if a.created_at else None,
-        })
+    # orjson writes the status enum as its value and created_at as ISO 8601
+    items = [dict(a._mapping) for a in apps]
 
-    return jsonify(ok=True, items=items)
+    return jsonify(ok=True, items=items, next_cursor=_next_cursor(apps, limit))
 
 
 # -----------------------
@@ -1466,37 +1816,48 @@ def debit_cards_my():
 # -----------------------
 @api_bp.get("/ops/debit_cards")
 @login_required
+@profile_if("PROFILE")
 def ops_debit_cards_list():
     _require_employee_or_admin()
     status_arg = (request.args.get("status") or "PENDING").upper()
 
-    q = (db.session.query(DebitCardApplication, Customer.full_name.label("customer_name"))
-         .join(Customer, Customer.id == DebitCardApplication.customer_id)
-         .order_by(DebitCardApplication.created_at.desc()))
-
+    q = _ops_debit_card_rows()
     if status_arg != "ALL":
         try:
             status_enum = RequestStatus[status_arg]
             q = q.filter(DebitCardApplication.status == status_enum)
         except KeyError:
             return jsonify(ok=False, message="invalid status"), 400
+    q, limit, err = _keyset_page(q, DebitCardApplication)
+    if err: return err
+    rows = q.all()
 
-    items = []
-    for app, cust_name in q.all():
-        items.append({
-            "id": app.id,
-            "customer_id": app.customer_id,
-            "customer_name": cust_name,
-            "account_no": app.account_no,
-            "card_type": app.card_type,
-            "preferred_limit": str(app.preferred_limit),
-            "status": app.status.value,
-            "created_at": app.created_at.isoformat() if app.created_at else None,
-            "pan_file_path": getattr(app, "pan_file_path", None),
-            "aadhaar_file_path": getattr(app, "aadhaar_file_path", None),
-        })
+    items = [dict(row._mapping) for row in rows]
 
-    return jsonify(ok=True, items=items)
+    return jsonify(ok=True, items=items, next_cursor=_next_cursor(rows, limit))
+
+def _ops_debit_card_rows():
+    # Rows already carry the response keys; Customer contributes only full_name
+    return (db.session.query(DebitCardApplication.id, DebitCardApplication.customer_id,
+                             Customer.full_name.label("customer_name"),
+                             DebitCardApplication.account_no, DebitCardApplication.card_type,
+                             _as_text(DebitCardApplication.preferred_limit), DebitCardApplication.status,
+                             DebitCardApplication.created_at, DebitCardApplication.pan_file_path,
+                             DebitCardApplication.aadhaar_file_path)
+            .join(Customer, Customer.id == DebitCardApplication.customer_id))
+
+
+# -----------------------
+# Employee: Get Single Debit Card Application
+# -----------------------
+@api_bp.get("/ops/debit_cards/<int:dc_app_id>")
+@login_required
+def ops_debit_card_get(dc_app_id: int):
+    _require_employee_or_admin()
+    row = _ops_debit_card_rows().filter(DebitCardApplication.id == dc_app_id).first()
+    if not row:
+        return jsonify(ok=False, message="Application not found"), 404
+    return jsonify(ok=True, dc_app=dict(row._mapping))
 
 
 # -----------------------
@@ -1506,15 +1867,11 @@ def ops_debit_cards_list():
 @login_required
 def ops_debit_card_approve(dc_app_id: int):
     _require_employee_or_admin()
-    app = DebitCardApplication.query.get(dc_app_id)
-    if not app:
-        return jsonify(ok=False, message="Application not found"), 404
-    if app.status != RequestStatus.PENDING:
-        return jsonify(ok=False, message=f"Already {app.status.value}"), 400
-
-    app.status = RequestStatus.APPROVED
+    err = _decide_pending(DebitCardApplication, dc_app_id, RequestStatus.APPROVED, "Application not found")
+    if err: return err
     db.session.commit()
-    return jsonify(ok=True, debit_card_app_id=app.id, status=app.status.value, message="Debit Card approved")
+    return jsonify(ok=True, debit_card_app_id=dc_app_id, status=RequestStatus.APPROVED.value,
+                   message="Debit Card approved")
 
 
 # -----------------------
@@ -1528,21 +1885,29 @@ def ops_debit_card_decline(dc_app_id: int):
     remark = (data.get("remark") or "").strip()
     if not remark:
         return jsonify(ok=False, message="Remark required"), 400
-    app = DebitCardApplication.query.get(dc_app_id)
-    if not app:
-        return jsonify(ok=False, message="Application not found"), 404
-    if app.status != RequestStatus.PENDING:
-        return jsonify(ok=False, message=f"Already {app.status.value}"), 400
-
-    app.status = RequestStatus.REJECTED
+    err = _decide_pending(DebitCardApplication, dc_app_id, RequestStatus.REJECTED, "Application not found")
+    if err: return err
     db.session.commit()
-    return jsonify(ok=True, debit_card_app_id=app.id, status=app.status.value, message="Debit Card declined")
+    return jsonify(ok=True, debit_card_app_id=dc_app_id, status=RequestStatus.REJECTED.value,
+                   message="Debit Card declined")
 
 
 # =========================
 # SIP (Systematic Investment Plan) APIs
 # =========================
 
+# Demo NAV range in 1/10000ths, matching nav_at_purchase Numeric(8, 4): 50.0000-200.0000
+_NAV_MIN_TICKS, _NAV_MAX_TICKS = 50_0000, 200_0000
+_UNITS_QUANT = Decimal("0.000001")  # units_purchased Numeric(14, 6)
+_SGB_UNITS_QUANT = Decimal("0.0001")  # SGBApplication.units Numeric(10, 4), grams
+
+# Expected return % p.a. per fund type; its keys are the accepted fund types
+SIP_EXPECTED_RETURNS = {
+    "EQUITY": Decimal("12.0"),
+    "DEBT": Decimal("8.0"),
+    "HYBRID": Decimal("10.0"),
+}
+
 # -----------------------
 # Customer: Apply for SIP
 # -----------------------
@@ -1570,15 +1935,15 @@ def sip_apply():
     if not fund_name or not fund_type or not monthly_amount_raw:
         return jsonify(ok=False, message="Fund name, type, and monthly amount are required"), 400
 
-    if fund_type not in ("EQUITY", "DEBT", "HYBRID"):
+    if fund_type not in SIP_EXPECTED_RETURNS:
         return jsonify(ok=False, message="Invalid fund type"), 400
 
     try:
-        monthly_amount = Decimal(str(monthly_amount_raw))
-        if monthly_amount <= 0:
-            return jsonify(ok=False, message="Monthly amount must be > 0"), 400
-    except (InvalidOperation, TypeError):
+        monthly_amount = _to_paise(monthly_amount_raw)
+    except ValueError:
         return jsonify(ok=False, message="Invalid monthly amount"), 400
+    if monthly_amount <= 0:
+        return jsonify(ok=False, message="Monthly amount must be > 0"), 400
 
     if tenure_months < 6 or tenure_months > 360:  # 6 months to 30 years
         return jsonify(ok=False, message="Tenure must be between 6 and 360 months"), 400
@@ -1588,13 +1953,6 @@ def sip_apply():
     except Exception:
         return jsonify(ok=False, message="Invalid start date (use YYYY-MM-DD)"), 400
 
-    # Set expected returns based on fund type
-    expected_returns = {
-        "EQUITY": Decimal("12.0"),
-        "DEBT": Decimal("8.0"), 
-        "HYBRID": Decimal("10.0")
-    }
-
     # Handle KYC document upload
     kyc_path = ""
     if files.get("kyc_file"):
@@ -1612,7 +1970,7 @@ def sip_apply():
         monthly_amount=monthly_amount,
         tenure_months=tenure_months,
         start_date=start_date,
-        expected_return_pa=expected_returns[fund_type],
+        expected_return_pa=SIP_EXPECTED_RETURNS[fund_type],
         status=RequestStatus.PENDING,
         kyc_file_path=kyc_path or None,
     )
@@ -1638,28 +1996,19 @@ def sip_my():
     if not cust:
         return jsonify(ok=False, message="Customer profile not found"), 404
 
-    apps = (db.session.query(SIPApplication)
-            .filter_by(customer_id=cust.id)
-            .order_by(SIPApplication.created_at.desc())
-            .all())
+    q = (db.session.query(SIPApplication.id, SIPApplication.fund_name, SIPApplication.fund_type,
+                          SIPApplication.monthly_amount, SIPApplication.tenure_months,
+                          _as_text(SIPApplication.expected_return_pa), SIPApplication.status,
+                          SIPApplication.is_active, SIPApplication.current_value,
+                          SIPApplication.total_invested, SIPApplication.created_at)
+         .filter(SIPApplication.customer_id == cust.id))
+    q, limit, err = _keyset_page(q, SIPApplication)
+    if err: return err
+    apps = q.all()
 
-    items = []
-    for a in apps:
-        items.append({
-            "id": a.id,
-            "fund_name": a.fund_name,
-            "fund_type": a.fund_type,
-            "monthly_amount": str(a.monthly_amount),
-            "tenure_months": a.tenure_months,
-            "expected_return_pa": str(a.expected_return_pa),
-            "status": a.status.value if a.status else "PENDING",
-            "is_active": a.is_active,
-            "current_value": str(a.current_value),
-            "total_invested": str(a.total_invested),
-            "created_at": a.created_at.isoformat() if a.created_at else None,
-        })
+    items = [_rupees_row(a, ("monthly_amount", "current_value", "total_invested")) for a in apps]
 
-    return jsonify(ok=True, items=items)
+    return jsonify(ok=True, items=items, next_cursor=_next_cursor(apps, limit))
 
 
 # -----------------------
@@ -1667,13 +2016,19 @@ def sip_my():
 # -----------------------
 @api_bp.get("/ops/sip")
 @login_required
+@profile_if("PROFILE")
 def ops_sip_list():
     _require_employee_or_admin()
     status_arg = (request.args.get("status") or "PENDING").upper()
 
-    q = (db.session.query(SIPApplication, Customer.full_name.label("customer_name"))
-         .join(Customer, Customer.id == SIPApplication.customer_id)
-         .order_by(SIPApplication.created_at.desc()))
+    q = (db.session.query(SIPApplication.id, SIPApplication.customer_id,
+                          Customer.full_name.label("customer_name"),
+                          SIPApplication.fund_name, SIPApplication.fund_type,
+                          SIPApplication.monthly_amount, SIPApplication.tenure_months,
+                          _as_text(SIPApplication.expected_return_pa), SIPApplication.status,
+                          SIPApplication.is_active, SIPApplication.created_at,
+                          SIPApplication.kyc_file_path)
+         .join(Customer, Customer.id == SIPApplication.customer_id))
 
     if status_arg != "ALL":
         try:
@@ -1681,25 +2036,13 @@ def ops_sip_list():
             q = q.filter(SIPApplication.status == status_enum)
         except KeyError:
             return jsonify(ok=False, message="invalid status"), 400
+    q, limit, err = _keyset_page(q, SIPApplication)
+    if err: return err
+    rows = q.all()
 
-    items = []
-    for app, cust_name in q.all():
-        items.append({
-            "id": app.id,
-            "customer_id": app.customer_id,
-            "customer_name": cust_name,
-            "fund_name": app.fund_name,
-            "fund_type": app.fund_type,
-            "monthly_amount": str(app.monthly_amount),
-            "tenure_months": app.tenure_months,
-            "expected_return_pa": str(app.expected_return_pa),
-            "status": app.status.value,
-            "is_active": app.is_active,
-            "created_at": app.created_at.isoformat() if app.created_at else None,
-            "kyc_file_path": app.kyc_file_path,
-        })
+    items = [_rupees_row(row, ("monthly_amount",)) for row in rows]
 
-    return jsonify(ok=True, items=items)
+    return jsonify(ok=True, items=items, next_cursor=_next_cursor(rows, limit))
 
 
 # -----------------------
@@ -1709,17 +2052,12 @@ def ops_sip_list():
 @login_required
 def ops_sip_approve(sip_app_id: int):
     _require_employee_or_admin()
-    app = SIPApplication.query.get(sip_app_id)
-    if not app:
-        return jsonify(ok=False, message="SIP application not found"), 404
-    if app.status != RequestStatus.PENDING:
-        return jsonify(ok=False, message=f"Already {app.status.value}"), 400
-
-    app.status = RequestStatus.APPROVED
-    app.is_active = True
+    err = _decide_pending(SIPApplication, sip_app_id, RequestStatus.APPROVED,
+                          "SIP application not found", is_active=True)
+    if err: return err
     db.session.commit()
 
-    return jsonify(ok=True, sip_app_id=app.id, status=app.status.value, message="SIP approved")
+    return jsonify(ok=True, sip_app_id=sip_app_id, status=RequestStatus.APPROVED.value, message="SIP approved")
 
 
 # -----------------------
@@ -1734,16 +2072,11 @@ def ops_sip_decline(sip_app_id: int):
     if not remark:
         return jsonify(ok=False, message="Remark required"), 400
 
-    app = SIPApplication.query.get(sip_app_id)
-    if not app:
-        return jsonify(ok=False, message="SIP application not found"), 404
-    if app.status != RequestStatus.PENDING:
-        return jsonify(ok=False, message=f"Already {app.status.value}"), 400
-
-    app.status = RequestStatus.REJECTED
+    err = _decide_pending(SIPApplication, sip_app_id, RequestStatus.REJECTED, "SIP application not found")
+    if err: return err
     db.session.commit()
 
-    return jsonify(ok=True, sip_app_id=app.id, status=app.status.value, message="SIP declined")
+    return jsonify(ok=True, sip_app_id=sip_app_id, status=RequestStatus.REJECTED.value, message="SIP declined")
 
 
 # -----------------------
@@ -1753,12 +2086,15 @@ def ops_sip_decline(sip_app_id: int):
 @login_required
 def ops_sip_get(sip_app_id: int):
     _require_employee_or_admin()
-    app = SIPApplication.query.get(sip_app_id)
+    # Customer and account come back in the same round trip as the application
+    app = db.session.get(SIPApplication, sip_app_id,
+                         options=[joinedload(SIPApplication.customer),
+                                  joinedload(SIPApplication.account)])
     if not app:
         return jsonify(ok=False, message="SIP application not found"), 404
 
-    customer = Customer.query.get(app.customer_id)
-    account = Account.query.get(app.account_id)
+    customer = app.customer
+    account = app.account
 
     return jsonify(ok=True, sip_app={
         "id": app.id,
@@ -1766,14 +2102,14 @@ def ops_sip_get(sip_app_id: int):
         "account_no": account.account_no if account else "Unknown",
         "fund_name": app.fund_name,
         "fund_type": app.fund_type,
-        "monthly_amount": float(app.monthly_amount),
+        "monthly_amount": _rupees(app.monthly_amount),
         "tenure_months": app.tenure_months,
         "start_date": app.start_date.isoformat() if app.start_date else None,
         "expected_return_pa": float(app.expected_return_pa),
         "status": app.status.value,
         "is_active": app.is_active,
-        "current_value": float(app.current_value or 0),
-        "total_invested": float(app.total_invested or 0),
+        "current_value": _rupees(app.current_value or 0),
+        "total_invested": _rupees(app.total_invested or 0),
         "kyc_file_path": app.kyc_file_path,
         "created_at": app.created_at.isoformat() if app.created_at else None,
         "updated_at": app.updated_at.isoformat() if app.updated_at else None
@@ -1787,7 +2123,7 @@ def ops_sip_get(sip_app_id: int):
 @login_required
 def ops_sip_docs(sip_app_id: int):
     _require_employee_or_admin()
-    app = SIPApplication.query.get(sip_app_id)
+    app = db.session.get(SIPApplication, sip_app_id)
     if not app:
         return jsonify(ok=False, message="SIP application not found"), 404
 
@@ -1807,70 +2143,56 @@ def ops_sip_docs(sip_app_id: int):
 # -----------------------
 @api_bp.post("/ops/sip/<int:sip_app_id>/process")
 @login_required
+@profile_if("PROFILE")
 def ops_sip_process(sip_app_id: int):
     _require_employee_or_admin()
     data = _json()
     
-    app = SIPApplication.query.get(sip_app_id)
+    app = db.session.get(SIPApplication, sip_app_id)
     if not app:
         return jsonify(ok=False, message="SIP application not found"), 404
     if not app.is_active:
         return jsonify(ok=False, message="SIP is not active"), 400
 
-    acc = Account.query.get(app.account_id)
+    acc = db.session.get(Account, app.account_id)
     if not acc or acc.status != AccountStatus.ACTIVE:
         return jsonify(ok=False, message="Account not active"), 400
 
-    # Check account balance
-    cr = db.session.query(func.coalesce(func.sum(LedgerEntry.amount), 0))\
-        .filter(LedgerEntry.account_id == acc.id, LedgerEntry.dr_cr == "CR").scalar()
-    dr = db.session.query(func.coalesce(func.sum(LedgerEntry.amount), 0))\
-        .filter(LedgerEntry.account_id == acc.id, LedgerEntry.dr_cr == "DR").scalar()
-    balance = Decimal(cr) - Decimal(dr)
-
-    if balance < app.monthly_amount:
+    # Bank transaction: debit customer account, credit investment GL (for demo).
+    # The funds check is the conditional Account.balance UPDATE itself.
+    monthly_paise = app.monthly_amount
+    if _post_transaction(TxType.TRANSFER, monthly_paise, {"account_id": acc.id},
+                         {"gl_code": "INVESTMENT_GL"}, check_funds=True) is None:
+        db.session.rollback()
         return jsonify(ok=False, message="Insufficient balance for SIP"), 400
 
-    # Simulate NAV and units (for demo)
-    import random
-    nav = Decimal(random.uniform(50.0, 200.0))  # Random NAV between 50-200
-    units = app.monthly_amount / nav
+    # Simulate NAV and units (for demo); built from an int so no float ever reaches Decimal
+    nav = Decimal(random.randint(_NAV_MIN_TICKS, _NAV_MAX_TICKS)).scaleb(-4)
+    units = (Decimal(monthly_paise).scaleb(-2) / nav).quantize(_UNITS_QUANT)
 
-    # Create SIP transaction record
-    sip_tx = SIPTransaction(
+    # Create SIP transaction record (Core insert: only its id is needed back)
+    sip_tx_id = db.session.execute(insert(SIPTransaction.__table__).values(
         sip_id=app.id,
         account_id=acc.id,
-        amount=app.monthly_amount,
+        amount=monthly_paise,
         transaction_date=date.today(),
         status=TxStatus.POSTED,
         nav_at_purchase=nav,
         units_purchased=units,
-    )
-    db.session.add(sip_tx)
-
-    # Create bank transaction
-    tx = Transaction(type=TxType.TRANSFER, status=TxStatus.POSTED, created_by=current_user.id)
-    db.session.add(tx)
-    db.session.flush()
-
-    # Debit customer account
-    db.session.add(LedgerEntry(transaction_id=tx.id, account_id=acc.id, dr_cr="DR", amount=app.monthly_amount))
-    # Credit investment GL (for demo)
-    db.session.add(LedgerEntry(transaction_id=tx.id, gl_code="INVESTMENT_GL", dr_cr="CR", amount=app.monthly_amount))
+    )).inserted_primary_key[0]
 
     # Update SIP totals
-    app.total_invested = (app.total_invested or 0) + app.monthly_amount
-    # Simulate growth
-    growth_factor = Decimal("1.02")  # 2% monthly growth
-    app.current_value = (app.current_value or 0) * growth_factor + app.monthly_amount
+    app.total_invested = (app.total_invested or 0) + monthly_paise
+    # Simulate 2% monthly growth, rounded half-up to the paisa
+    app.current_value = ((app.current_value or 0) * 102 + 50) // 100 + monthly_paise
 
     db.session.commit()
 
     return jsonify(
         ok=True,
         sip_app_id=app.id,
-        transaction_id=sip_tx.id,
-        amount=float(app.monthly_amount),
+        transaction_id=sip_tx_id,
+        amount=_rupees(monthly_paise),
         nav=float(nav),
         units=float(units),
         message="SIP investment processed"
@@ -1896,32 +2218,29 @@ def sgb_apply():
         return jsonify(ok=False, message="No active account found"), 404
 
     # Handle both JSON and FormData
-    if request.is_json:
-        data = _json()
-    else:
-        data = request.form.to_dict()
+    data = _json()
     
     series = (data.get("series") or "").strip()
     investment_amount = data.get("investment_amount")
     pan_number = (data.get("pan_number") or "").strip().upper()
     
-    # Convert investment_amount to float if it's a string
+    # Rupees in, paise stored
     if investment_amount:
         try:
-            investment_amount = float(investment_amount)
-        except (ValueError, TypeError):
+            investment_amount = _to_paise(investment_amount)
+        except ValueError:
             investment_amount = None
 
     if not series:
         return jsonify(ok=False, message="Series is required"), 400
     if not investment_amount or investment_amount <= 0:
         return jsonify(ok=False, message="Valid investment amount required"), 400
-    if not pan_number or len(pan_number) != 10:
+    if not _PAN_RE.fullmatch(pan_number):
         return jsonify(ok=False, message="Valid PAN number required"), 400
 
     # Calculate units based on current gold price (simulated)
-    current_gold_price = 6500  # ₹ per gram (simulated)
-    units = Decimal(str(investment_amount)) / Decimal(str(current_gold_price))
+    current_gold_price = 650000  # paise per gram (₹6,500, simulated)
+    units = (Decimal(investment_amount) / current_gold_price).quantize(_SGB_UNITS_QUANT)
 
     # Save KYC file if provided
     kyc_path = None
@@ -1940,6 +2259,7 @@ def sgb_apply():
         investment_amount=investment_amount,
         units=units,
         pan_number=pan_number,
+        pan_hmac=pii_hmac(pan_number),
         kyc_file_path=kyc_path,
         current_value=investment_amount  # Initially same as investment
     )
@@ -1963,25 +2283,29 @@ def sgb_my():
     if not cust:
         return jsonify(ok=False, message="Customer profile not found"), 404
 
-    apps = (db.session.query(SGBApplication)
-            .filter_by(customer_id=cust.id)
-            .order_by(SGBApplication.created_at.desc())
-            .all())
+    q = (db.session.query(SGBApplication.id, SGBApplication.series,
+                          SGBApplication.investment_amount, SGBApplication.units,
+                          SGBApplication.current_value, SGBApplication.interest_earned,
+                          SGBApplication.status, SGBApplication.created_at)
+         .filter(SGBApplication.customer_id == cust.id))
+    q, limit, err = _keyset_page(q, SGBApplication)
+    if err: return err
+    apps = q.all()
 
     items = []
     for a in apps:
         items.append({
             "id": a.id,
             "series": a.series,
-            "investment_amount": float(a.investment_amount),
+            "investment_amount": _rupees(a.investment_amount),
             "units": float(a.units),
-            "current_value": float(a.current_value or 0),
-            "interest_earned": float(a.interest_earned or 0),
+            "current_value": _rupees(a.current_value or 0),
+            "interest_earned": _rupees(a.interest_earned or 0),
             "status": a.status.value,
             "created_at": a.created_at.isoformat() if a.created_at else None
         })
 
-    return jsonify(ok=True, items=items)
+    return jsonify(ok=True, items=items, next_cursor=_next_cursor(apps, limit))
 
 
 # -----------------------
@@ -1989,13 +2313,15 @@ def sgb_my():
 # -----------------------
 @api_bp.get("/ops/sgb")
 @login_required
+@profile_if("PROFILE")
 def ops_sgb_list():
     _require_employee_or_admin()
     status_arg = (request.args.get("status") or "PENDING").upper()
 
-    q = (db.session.query(SGBApplication, Customer.full_name.label("customer_name"))
-         .join(Customer, Customer.id == SGBApplication.customer_id)
-         .order_by(SGBApplication.created_at.desc()))
+    q = (db.session.query(SGBApplication.id, Customer.full_name.label("customer_name"),
+                          SGBApplication.series, SGBApplication.investment_amount,
+                          SGBApplication.units, SGBApplication.status, SGBApplication.created_at)
+         .join(Customer, Customer.id == SGBApplication.customer_id))
 
     if status_arg != "ALL":
         try:
@@ -2003,20 +2329,23 @@ def ops_sgb_list():
             q = q.filter(SGBApplication.status == status_enum)
         except KeyError:
             return jsonify(ok=False, message="invalid status"), 400
+    q, limit, err = _keyset_page(q, SGBApplication)
+    if err: return err
+    rows = q.all()
 
     items = []
-    for app, cust_name in q.all():
+    for row in rows:
         items.append({
-            "id": app.id,
-            "customer_name": cust_name,
-            "series": app.series,
-            "investment_amount": float(app.investment_amount),
-            "units": float(app.units),
-            "status": app.status.value,
-            "created_at": app.created_at.isoformat() if app.created_at else None
+            "id": row.id,
+            "customer_name": row.customer_name,
+            "series": row.series,
+            "investment_amount": _rupees(row.investment_amount),
+            "units": float(row.units),
+            "status": row.status.value,
+            "created_at": row.created_at.isoformat() if row.created_at else None
         })
 
-    return jsonify(ok=True, items=items)
+    return jsonify(ok=True, items=items, next_cursor=_next_cursor(rows, limit))
 
 
 # -----------------------
@@ -2026,13 +2355,8 @@ def ops_sgb_list():
 @login_required
 def ops_sgb_approve(sgb_app_id: int):
     _require_employee_or_admin()
-    app = SGBApplication.query.get(sgb_app_id)
-    if not app:
-        return jsonify(ok=False, message="SGB application not found"), 404
-    if app.status != RequestStatus.PENDING:
-        return jsonify(ok=False, message=f"Already {app.status.value}"), 400
-
-    app.status = RequestStatus.APPROVED
+    err = _decide_pending(SGBApplication, sgb_app_id, RequestStatus.APPROVED, "SGB application not found")
+    if err: return err
     try:
         db.session.commit()
         return jsonify(ok=True, message="SGB application approved")
@@ -2053,13 +2377,8 @@ def ops_sgb_decline(sgb_app_id: int):
     if not remark:
         return jsonify(ok=False, message="Remark required"), 400
 
-    app = SGBApplication.query.get(sgb_app_id)
-    if not app:
-        return jsonify(ok=False, message="SGB application not found"), 404
-    if app.status != RequestStatus.PENDING:
-        return jsonify(ok=False, message=f"Already {app.status.value}"), 400
-
-    app.status = RequestStatus.REJECTED
+    err = _decide_pending(SGBApplication, sgb_app_id, RequestStatus.REJECTED, "SGB application not found")
+    if err: return err
     try:
         db.session.commit()
         return jsonify(ok=True, message="SGB application declined")
@@ -2075,23 +2394,26 @@ def ops_sgb_decline(sgb_app_id: int):
 @login_required
 def ops_sgb_get(sgb_app_id: int):
     _require_employee_or_admin()
-    app = SGBApplication.query.get(sgb_app_id)
+    # Customer and account come back in the same round trip as the application
+    app = db.session.get(SGBApplication, sgb_app_id,
+                         options=[joinedload(SGBApplication.customer),
+                                  joinedload(SGBApplication.account)])
     if not app:
         return jsonify(ok=False, message="SGB application not found"), 404
 
-    customer = Customer.query.get(app.customer_id)
-    account = Account.query.get(app.account_id)
+    customer = app.customer
+    account = app.account
 
     return jsonify(ok=True, sgb_app={
         "id": app.id,
         "customer_name": customer.full_name if customer else "Unknown",
         "account_no": account.account_no if account else "Unknown",
         "series": app.series,
-        "investment_amount": float(app.investment_amount),
+        "investment_amount": _rupees(app.investment_amount),
         "units": float(app.units),
         "pan_number": app.pan_number,
-        "current_value": float(app.current_value or 0),
-        "interest_earned": float(app.interest_earned or 0),
+        "current_value": _rupees(app.current_value or 0),
+        "interest_earned": _rupees(app.interest_earned or 0),
         "status": app.status.value,
         "kyc_file_path": app.kyc_file_path,
         "created_at": app.created_at.isoformat() if app.created_at else None,
@@ -1,14 +1,29 @@
 # backend/auth.py
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_login import login_user, logout_user, login_required
+from sqlalchemy import exists, insert, select
+from sqlalchemy.exc import IntegrityError
 from database.models import db, User, Role, UserRole
+from .api import _on_bcrypt_pool
 
 auth_bp = Blueprint("auth", __name__)
 
 def _json():
     if request.is_json:
         return request.get_json(silent=True) or {}
-    return request.form.to_dict()
+    # Read-only MultiDict; .get() works the same without copying into a dict
+    return request.form
+
+# Role rows are seed data that never change at runtime; name -> id, hits only
+_ROLE_IDS = {}
+
+def _role_id(name: str):
+    role_id = _ROLE_IDS.get(name)
+    if role_id is None:
+        role_id = db.session.execute(select(Role.id).where(Role.name == name)).scalar()
+        if role_id is not None:  # a missing role is looked up again once it's seeded
+            _ROLE_IDS[name] = role_id
+    return role_id
 
 @auth_bp.post("/register")
 def register():
@@ -21,18 +36,24 @@ def register():
     if not all([first, last, email, pwd]):
         return jsonify(ok=False, message="All fields are required."), 400
 
-    if User.query.filter_by(email=email).first():
+    # Cheap index probe so a taken email doesn't cost a bcrypt hash; the unique
+    # index stays the real check for two registrations racing past it
+    if db.session.execute(select(exists().where(User.email == email))).scalar():
         return jsonify(ok=False, message="Email already registered."), 409
 
     user = User(first_name=first, last_name=last, email=email)
-    user.set_password(pwd)
+    _on_bcrypt_pool(user.set_password, pwd, current_app.config["BCRYPT_COST"])
     db.session.add(user)
-    db.session.flush()  # get user.id before role link
+    try:
+        db.session.flush()  # get user.id before role link
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify(ok=False, message="Email already registered."), 409
 
     # Attach CUSTOMER role if it exists
-    customer_role = Role.query.filter_by(name="CUSTOMER").first()
-    if customer_role:
-        db.session.add(UserRole(user_id=user.id, role_id=customer_role.id))
+    customer_role_id = _role_id("CUSTOMER")
+    if customer_role_id is not None:
+        db.session.execute(insert(UserRole.__table__).values(user_id=user.id, role_id=customer_role_id))
 
     db.session.commit()
     return jsonify(ok=True, message="Registration successful. Please log in."), 201
@@ -44,8 +65,15 @@ def login():
     pwd   = (data.get("password") or "").strip()
 
     user = User.query.filter_by(email=email).first()
-    if not user or not user.check_password(pwd):
+    if not user:
+        return jsonify(ok=False, message="Invalid email or password."), 401
+    if not _on_bcrypt_pool(user.check_password, pwd):
         return jsonify(ok=False, message="Invalid email or password."), 401
+    cost = current_app.config["BCRYPT_COST"]
+    if user.password_needs_rehash(cost):
+        # Cost policy went up since this hash was made; upgrade it while we have the password
+        _on_bcrypt_pool(user.set_password, pwd, cost)
+        db.session.commit()
 
     login_user(user)
     return jsonify(
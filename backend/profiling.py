@@ -0,0 +1,32 @@
+# backend/profiling.py
+import cProfile
+import os
+import time
+from functools import wraps
+
+from flask import request
+
+
+def profile_if(flag: str = "PROFILE"):
+    """Dump a cProfile .prof for the wrapped view when the `flag` env var asks for it.
+
+    flag=1 profiles every call; flag=header profiles only requests sent with
+    "X-Profile: 1". Unset or any other value (the default) costs one environ
+    lookup. Files land in PROFILE_DIR (default /tmp/prof) as
+    <endpoint>-<ms>.prof; open them with snakeviz or pstats.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            mode = os.environ.get(flag)
+            if not (mode == "1" or (mode == "header" and request.headers.get("X-Profile") == "1")):
+                return fn(*args, **kwargs)
+            prof = cProfile.Profile()
+            try:
+                return prof.runcall(fn, *args, **kwargs)
+            finally:
+                out_dir = os.environ.get("PROFILE_DIR", "/tmp/prof")
+                os.makedirs(out_dir, exist_ok=True)
+                prof.dump_stats(os.path.join(out_dir, f"{request.endpoint}-{int(time.time() * 1000)}.prof"))
+        return wrapper
+    return decorator
@@ -1,17 +1,33 @@
 # database/models.py
 
+import bcrypt
+import hmac
+from flask import current_app
 from flask_login import UserMixin
-from passlib.hash import bcrypt
-from datetime import datetime
-from sqlalchemy import CheckConstraint
+from sqlalchemy import CheckConstraint, text, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.mysql import BIGINT as MyBigInt
 import enum
-from datetime import date
+import os
 
 # Import the shared SQLAlchemy instance
 from . import db
 
+# Relationships without an explicit lazy= use this. STRICT_LOADING=1 (dev/test)
+# turns any implicit lazy load into an error, so N+1 sites surface as 500s
+# instead of quietly adding a query per row; call sites then name their
+# loader (joinedload/selectinload) explicitly.
+_LAZY = "raise_on_sql" if os.environ.get("STRICT_LOADING") == "1" else "select"
+
+
+def pii_hmac(value):
+    """Keyed SHA-256 of a PAN/Aadhaar number: a fixed 32-byte lookup key that isn't the number itself."""
+    if not value:
+        return None
+    key = current_app.config["PII_HMAC_KEY"]  # create_app() refuses to start without it
+    return hmac.new(key.encode("utf-8"), value.strip().upper().encode("utf-8"), "sha256").digest()
+
 
 # ---------- Users ----------
 class User(db.Model, UserMixin):
@@ -21,16 +37,29 @@ class User(db.Model, UserMixin):
     last_name  = db.Column(db.String(80), nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
     password_hash = db.Column(db.String(255), nullable=False)
-    created_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
 
     # Relationships
-    customer = relationship("Customer", back_populates="user", uselist=False)
+    customer = relationship("Customer", back_populates="user", uselist=False, lazy=_LAZY)
+    roles = relationship("UserRole", back_populates="user", lazy=_LAZY)
 
-    def set_password(self, password: str) -> None:
-        self.password_hash = bcrypt.hash(password)
+    def set_password(self, password: str, cost: int = None) -> None:
+        # Straight to the C extension; hashes stay $2b$ so passlib-era rows still verify.
+        # Pass `cost` when calling off the app context (e.g. on the bcrypt pool).
+        if cost is None:
+            cost = current_app.config.get("BCRYPT_COST", 12)
+        self.password_hash = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=cost)).decode("ascii")
 
     def check_password(self, password: str) -> bool:
-        return bcrypt.verify(password, self.password_hash)
+        # No app context needed: login runs this on the bcrypt pool thread
+        return bcrypt.checkpw(password.encode("utf-8"), self.password_hash.encode("ascii"))
+
+    def password_needs_rehash(self, cost: int) -> bool:
+        # "$2b$<cost>$<salt+hash>"; only ever raised, so a lower target leaves hashes alone
+        try:
+            return int(self.password_hash.split("$")[2]) < cost
+        except (IndexError, ValueError):
+            return False
 
 
 # ---------- Roles ----------
@@ -46,6 +75,10 @@ class UserRole(db.Model):
     user_id = db.Column(MyBigInt(unsigned=True), db.ForeignKey("users.id"), nullable=False, index=True)
     role_id = db.Column(MyBigInt(unsigned=True), db.ForeignKey("roles.id"), nullable=False, index=True)
 
+    # Relationships
+    user = relationship("User", back_populates="roles", lazy=_LAZY)
+    role = relationship("Role", lazy=_LAZY)
+
 
 # ---------- Enums ----------
 class KYCStatus(enum.Enum):
@@ -85,6 +118,15 @@ class LoanStatus(enum.Enum):
     DEFAULT = "DEFAULT"
 
 
+def _enum_str(enum_cls, check_name: str):
+    """Enum column stored as VARCHAR(24) + a named CHECK rather than a native MySQL ENUM.
+
+    A new member is then a constraint swap, not a table rebuild; Python code still
+    reads and writes the enum members as before.
+    """
+    return db.Enum(enum_cls, native_enum=False, length=24, create_constraint=True, name=check_name)
+
+
 # Reference GL codes
 GL_CASH_VAULT = "CASH_VAULT"
 GL_BANK_LOAN = "BANK_LOAN_GL"
@@ -95,19 +137,24 @@ class Customer(db.Model):
     __tablename__ = "customers"
     id = db.Column(MyBigInt(unsigned=True), primary_key=True)
     user_id = db.Column(MyBigInt(unsigned=True), db.ForeignKey("users.id"), unique=True, nullable=False, index=True)
-    full_name = db.Column(db.String(160), nullable=False)
+    full_name = db.Column(db.String(120), nullable=False)
     phone = db.Column(db.String(24))
     address = db.Column(db.Text)
-    kyc_status = db.Column(db.Enum(KYCStatus), nullable=False, default=KYCStatus.PENDING)
-    created_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
-
-    # Relationships
-    user = relationship("User", back_populates="customer")
-    accounts = relationship("Account", back_populates="customer", cascade="all, delete-orphan")
-    account_requests = relationship("AccountRequest", back_populates="customer", cascade="all, delete-orphan")
-    loan_applications = relationship("LoanApplication", back_populates="customer", cascade="all, delete-orphan")
-    loans = relationship("Loan", back_populates="customer", cascade="all, delete-orphan")
-    credit_card_applications = relationship("CreditCardApplication", back_populates="customer", cascade="all, delete-orphan")
+    kyc_status = db.Column(_enum_str(KYCStatus, "chk_customers_kyc_status"), nullable=False, default=KYCStatus.PENDING)
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
+
+    # Relationships. _get_customer() runs on nearly every request, so the collections never
+    # load implicitly: eager-by-default would add a query each, lazy an N+1 per iteration.
+    # Query them directly or use selectinload() where one is needed.
+    user = relationship("User", back_populates="customer", lazy=_LAZY)
+    accounts = relationship("Account", back_populates="customer", cascade="all, delete-orphan", lazy="raise")
+    account_requests = relationship("AccountRequest", back_populates="customer", cascade="all, delete-orphan",
+                                    lazy="raise")
+    loan_applications = relationship("LoanApplication", back_populates="customer", cascade="all, delete-orphan",
+                                     lazy="raise")
+    loans = relationship("Loan", back_populates="customer", cascade="all, delete-orphan", lazy="raise")
+    credit_card_applications = relationship("CreditCardApplication", back_populates="customer",
+                                            cascade="all, delete-orphan", lazy="raise")
 
 
 class Branch(db.Model):
@@ -119,19 +166,49 @@ class Branch(db.Model):
     address = db.Column(db.Text)
 
     # Relationships
-    accounts = relationship("Account", back_populates="branch")
-    requests = relationship("AccountRequest", back_populates="branch")
-    number_seq = relationship("AccountNumberSeq", back_populates="branch", uselist=False)
+    accounts = relationship("Account", back_populates="branch", lazy=_LAZY)
+    requests = relationship("AccountRequest", back_populates="branch", lazy=_LAZY)
+    number_seq = relationship("AccountNumberSeq", back_populates="branch", uselist=False, lazy=_LAZY)
 
 
 class AccountNumberSeq(db.Model):
     __tablename__ = "account_number_seq"
     id = db.Column(MyBigInt(unsigned=True), primary_key=True)
     branch_id = db.Column(MyBigInt(unsigned=True), db.ForeignKey("branches.id"), nullable=False, unique=True)
-    next_serial = db.Column(MyBigInt(unsigned=True), nullable=False, default=1000000001)
+    START = 1000000001
+    next_serial = db.Column(MyBigInt(unsigned=True), nullable=False, default=START)
 
     # Relationships
-    branch = relationship("Branch", back_populates="number_seq")
+    branch = relationship("Branch", back_populates="number_seq", lazy=_LAZY)
+
+    @classmethod
+    def next(cls, branch_id) -> int:
+        """Take the branch's next account serial with one atomic UPDATE (no read-modify-write race)."""
+        if db.session.get_bind().dialect.name == "mysql":
+            # LAST_INSERT_ID(expr) hands the pre-increment value back in the OK packet
+            res = db.session.execute(
+                text("UPDATE account_number_seq SET next_serial = LAST_INSERT_ID(next_serial) + 1 "
+                     "WHERE branch_id = :b"),
+                {"b": branch_id},
+            )
+            if res.rowcount:
+                return int(res.lastrowid)
+        else:
+            res = db.session.execute(
+                update(cls).where(cls.branch_id == branch_id).values(next_serial=cls.next_serial + 1)
+            )
+            if res.rowcount:
+                # Our UPDATE holds the row lock, so this sees exactly our increment
+                return int(db.session.query(cls.next_serial)
+                           .filter(cls.branch_id == branch_id).scalar()) - 1
+        # First account at this branch: create the sequence row
+        try:
+            with db.session.begin_nested():
+                db.session.add(cls(branch_id=branch_id, next_serial=cls.START + 1))
+            return cls.START
+        except IntegrityError:
+            # A concurrent approval created it first; take the next value from that row
+            return cls.next(branch_id)
 
 
 class AccountRequest(db.Model):
@@ -148,22 +225,35 @@ class AccountRequest(db.Model):
     gender = db.Column(db.String(10), nullable=True)
     aadhaar_no = db.Column(db.String(12), nullable=False)      # 12 digits
     pan_no = db.Column(db.String(10), nullable=False)           # e.g., ABCDE1234F
+    # pii_hmac() of the two numbers above; match on these, never on the raw columns
+    aadhaar_hmac = db.Column(db.BINARY(32), index=True)
+    pan_hmac = db.Column(db.BINARY(32), index=True)
     perm_address = db.Column(db.Text, nullable=False)           # with PIN code
     comm_address = db.Column(db.Text, nullable=True)            # if different
     occupation_type = db.Column(db.String(30), nullable=False)  # Salaried/Self-Employed/Student/Retired
     annual_income_range = db.Column(db.String(30), nullable=False)
 
     # Uploaded document paths (relative)
-    aadhaar_file_path = db.Column(db.String(255))
-    pan_file_path = db.Column(db.String(255))
-    photo_file_path = db.Column(db.String(255))
+    aadhaar_file_path = db.Column(db.String(160))
+    pan_file_path = db.Column(db.String(160))
+    photo_file_path = db.Column(db.String(160))
+    # SHA-256 of each uploaded file (hex), computed while saving
+    aadhaar_sha256 = db.Column(db.String(64))
+    pan_sha256 = db.Column(db.String(64))
+    photo_sha256 = db.Column(db.String(64))
 
-    status = db.Column(db.Enum(RequestStatus), nullable=False, default=RequestStatus.PENDING)
-    created_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
+    status = db.Column(_enum_str(RequestStatus, "chk_account_requests_status"), nullable=False, default=RequestStatus.PENDING)
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
 
     # Relationships
-    customer = relationship("Customer", back_populates="account_requests")
-    branch = relationship("Branch", back_populates="requests")
+    customer = relationship("Customer", back_populates="account_requests", lazy=_LAZY)
+    branch = relationship("Branch", back_populates="requests", lazy=_LAZY)
+
+
+# The ops queue pages PENDING requests newest-first; status leads, so that
+# slice is one contiguous range of the index however many requests are closed.
+db.Index("ix_acct_req_status_created", AccountRequest.status, AccountRequest.created_at.desc(),
+         AccountRequest.id.desc())
 
 
 class Account(db.Model):
@@ -171,16 +261,19 @@ class Account(db.Model):
     id = db.Column(MyBigInt(unsigned=True), primary_key=True)
     customer_id = db.Column(MyBigInt(unsigned=True), db.ForeignKey("customers.id"), nullable=False, index=True)
     branch_id = db.Column(MyBigInt(unsigned=True), db.ForeignKey("branches.id"), nullable=False)
-    account_no = db.Column(db.String(32), unique=True, nullable=False, index=True)
+    account_no = db.Column(db.String(20), unique=True, nullable=False, index=True)  # branch code (<=10) + 10-digit serial
     product = db.Column(db.String(32), nullable=False)
-    status = db.Column(db.Enum(AccountStatus), nullable=False, default=AccountStatus.APPROVAL_PENDING)
-    created_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
+    status = db.Column(_enum_str(AccountStatus, "chk_accounts_status"), nullable=False, default=AccountStatus.APPROVAL_PENDING)
+    # Running ledger balance in paise, moved by every posting in the same transaction
+    balance = db.Column(db.BigInteger, nullable=False, default=0, server_default="0")
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
 
-    # Relationships
-    customer = relationship("Customer", back_populates="accounts")
-    branch = relationship("Branch", back_populates="accounts", lazy="joined")
-    ib = relationship("InternetBanking", back_populates="account", uselist=False, cascade="all, delete-orphan")
-    ledger_entries = relationship("LedgerEntry", back_populates="account", cascade="all, delete-orphan")
+    # Relationships (load explicitly with joinedload/selectinload; most reads need none of them)
+    customer = relationship("Customer", back_populates="accounts", lazy="raise")
+    branch = relationship("Branch", back_populates="accounts", lazy="raise")
+    ib = relationship("InternetBanking", back_populates="account", uselist=False, cascade="all, delete-orphan",
+                      lazy="raise")
+    ledger_entries = relationship("LedgerEntry", back_populates="account", cascade="all, delete-orphan", lazy=_LAZY)
 
 
 # ---------- Internet Banking (per account) ----------
@@ -196,56 +289,83 @@ class InternetBanking(db.Model):
     )
     pin_hash = db.Column(db.String(255), nullable=False)
     pin_hint = db.Column(db.String(2))  # store ONLY last 2 digits for display
-    created_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
 
     # Relationships
-    account = relationship("Account", back_populates="ib")
+    account = relationship("Account", back_populates="ib", lazy=_LAZY)
+
+    def verify_pin(self, pin: str) -> bool:
+        # checkpw compares the digests in constant time; safe to run on the bcrypt pool
+        return bcrypt.checkpw(pin.encode("utf-8"), self.pin_hash.encode("ascii"))
+
+    @staticmethod
+    def hint_equals(a: str, b: str) -> bool:
+        # Never compare PIN material with ==, which returns at the first differing char
+        return hmac.compare_digest((a or "").encode("utf-8"), (b or "").encode("utf-8"))
 
 
 # ---------- Transactions & Ledger ----------
 class Transaction(db.Model):
     __tablename__ = "transactions"
     id = db.Column(MyBigInt(unsigned=True), primary_key=True)
-    type = db.Column(db.Enum(TxType), nullable=False)
-    status = db.Column(db.Enum(TxStatus), nullable=False, default=TxStatus.PENDING)
+    type = db.Column(_enum_str(TxType, "chk_transactions_type"), nullable=False)
+    status = db.Column(_enum_str(TxStatus, "chk_transactions_status"), nullable=False, default=TxStatus.PENDING)
     created_by = db.Column(MyBigInt(unsigned=True), db.ForeignKey("users.id"))
-    created_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
 
 
 class LedgerEntry(db.Model):
     __tablename__ = "ledger_entries"
     id = db.Column(MyBigInt(unsigned=True), primary_key=True)
     transaction_id = db.Column(MyBigInt(unsigned=True), db.ForeignKey("transactions.id"), nullable=False, index=True)
-    account_id = db.Column(MyBigInt(unsigned=True), db.ForeignKey("accounts.id"), nullable=True, index=True)
+    # No single-column index: both composite indexes below lead with account_id (and back the FK)
+    account_id = db.Column(MyBigInt(unsigned=True), db.ForeignKey("accounts.id"), nullable=True)
     gl_code = db.Column(db.String(64), nullable=True)  # e.g., CASH_VAULT, BANK_LOAN_GL
     dr_cr = db.Column(db.String(2), nullable=False)    # "DR" or "CR"
-    amount = db.Column(db.Numeric(14, 2), nullable=False)
-    posted_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
+    amount = db.Column(db.BigInteger, nullable=False)  # integer paise (1/100 rupee)
+    posted_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
     __table_args__ = (
         CheckConstraint("(account_id IS NOT NULL) OR (gl_code IS NOT NULL)", name="chk_account_or_gl"),
+        # Covers the balance aggregate so it never touches the table rows
+        db.Index("ix_ledger_acct_drcr_amt", "account_id", "dr_cr", "amount"),
     )
 
-    # Relationships
-    account = relationship("Account", back_populates="ledger_entries")
+    # Relationships (load explicitly with joinedload/selectinload)
+    account = relationship("Account", back_populates="ledger_entries", lazy="raise")
+    transaction = relationship("Transaction", lazy="raise")
+
+
+# Keyset pagination for an account's statement: newest first, id as tie-breaker
+db.Index("ix_ledger_acct_posted_id", LedgerEntry.account_id, LedgerEntry.posted_at.desc(), LedgerEntry.id.desc())
 
 
 # ---------- Loans ----------
 class LoanApplication(db.Model):
     __tablename__ = "loan_applications"
     id = db.Column(MyBigInt(unsigned=True), primary_key=True)
-    customer_id = db.Column(MyBigInt(unsigned=True), db.ForeignKey("customers.id"), nullable=False, index=True)
-    amount = db.Column(db.Numeric(14, 2), nullable=False)
+    customer_id = db.Column(MyBigInt(unsigned=True), db.ForeignKey("customers.id"), nullable=False)
+    amount = db.Column(db.BigInteger, nullable=False)  # integer paise
     product = db.Column(db.String(32), nullable=False)   # PERSONAL, EDUCATION...
     purpose = db.Column(db.Text, nullable=True)          # <-- required by /api/loans/apply
     pan_num = db.Column(db.String(10), nullable=True)     # match DB column
     aadhaar_no = db.Column(db.String(12), nullable=True)     # new column
+    pan_hmac = db.Column(db.BINARY(32), index=True)      # pii_hmac(pan_num)
+    aadhaar_hmac = db.Column(db.BINARY(32), index=True)  # pii_hmac(aadhaar_no)
     occupation = db.Column(db.String(120), nullable=True)    # match DB size
 
-    status = db.Column(db.Enum(RequestStatus), nullable=False, default=RequestStatus.PENDING)
-    created_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
+    status = db.Column(_enum_str(RequestStatus, "chk_loan_applications_status"), nullable=False, default=RequestStatus.PENDING)
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
 
     # Relationships
-    customer = relationship("Customer", back_populates="loan_applications")
+    customer = relationship("Customer", back_populates="loan_applications", lazy="raise")
+    detail = relationship("LoanApplicationDetail", uselist=False, lazy=_LAZY)
+    docs = relationship("LoanApplicationDoc", lazy=_LAZY)
+
+
+# Ops queue filters by status, "my loans" by customer_id; both newest-first.
+# customer_id leads ix_loan_app_cust_created, which doubles as the FK index.
+db.Index("ix_loan_app_status_created", LoanApplication.status, LoanApplication.created_at.desc())
+db.Index("ix_loan_app_cust_created", LoanApplication.customer_id, LoanApplication.created_at.desc())
 
 
 class LoanApplicationDetail(db.Model):
@@ -260,8 +380,8 @@ class LoanApplicationDetail(db.Model):
     rate_pa = db.Column(db.Numeric(5, 2))       # set during approval
     stage = db.Column(db.String(24), nullable=False, default="SUBMITTED")  # SUBMITTED/UNDER_REVIEW/APPROVED/REJECTED
 
-    created_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
-    updated_at = db.Column(db.DateTime, server_default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
+    updated_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
 
 
 class LoanApplicationDoc(db.Model):
@@ -270,8 +390,8 @@ class LoanApplicationDoc(db.Model):
     application_id = db.Column(MyBigInt(unsigned=True), db.ForeignKey("loan_applications.id"), nullable=False, index=True)
     doc_type = db.Column(db.String(32), nullable=False)  # AADHAAR, PAN, INCOME_PROOF, PHOTO
     file_name = db.Column(db.String(255), nullable=False)
-    file_path = db.Column(db.String(255), nullable=False)
-    uploaded_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
+    file_path = db.Column(db.String(160), nullable=False)
+    uploaded_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
 
 
 class LoanAppHistory(db.Model):
@@ -282,34 +402,38 @@ class LoanAppHistory(db.Model):
     to_stage = db.Column(db.String(24), nullable=False)
     remarks = db.Column(db.Text)
     actor_user_id = db.Column(MyBigInt(unsigned=True))
-    created_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
 
 
 class Loan(db.Model):
     __tablename__ = "loans"
     id = db.Column(MyBigInt(unsigned=True), primary_key=True)
     customer_id = db.Column(MyBigInt(unsigned=True), db.ForeignKey("customers.id"), nullable=False, index=True)
-    principal = db.Column(db.Numeric(14, 2), nullable=False)
+    principal = db.Column(db.BigInteger, nullable=False)  # integer paise
     rate_pa = db.Column(db.Numeric(5, 2), nullable=False)  # % per annum
     term_months = db.Column(db.Integer, nullable=False)
-    status = db.Column(db.Enum(LoanStatus), nullable=False, default=LoanStatus.ACTIVE)
-    start_date = db.Column(db.Date, nullable=False, default=date.today)
+    status = db.Column(_enum_str(LoanStatus, "chk_loans_status"), nullable=False, default=LoanStatus.ACTIVE)
+    # Parenthesised so MySQL 8 accepts CURRENT_DATE as an expression default
+    start_date = db.Column(db.Date, nullable=False, server_default=db.text("(CURRENT_DATE)"))
 
     # Relationships
-    customer = relationship("Customer", back_populates="loans")
+    customer = relationship("Customer", back_populates="loans", lazy=_LAZY)
 
 
 class RepaymentSchedule(db.Model):
     __tablename__ = "repayment_schedule"
     id = db.Column(MyBigInt(unsigned=True), primary_key=True)
-    loan_id = db.Column(MyBigInt(unsigned=True), db.ForeignKey("loans.id"), nullable=False, index=True)
+    loan_id = db.Column(MyBigInt(unsigned=True), db.ForeignKey("loans.id"), nullable=False)
     due_date = db.Column(db.Date, nullable=False)
-    emi = db.Column(db.Numeric(14, 2), nullable=False)
-    principal_part = db.Column(db.Numeric(14, 2), nullable=False)
-    interest_part = db.Column(db.Numeric(14, 2), nullable=False)
+    emi = db.Column(db.BigInteger, nullable=False)  # integer paise
+    principal_part = db.Column(db.BigInteger, nullable=False)  # integer paise
+    interest_part = db.Column(db.BigInteger, nullable=False)  # integer paise
     status = db.Column(db.String(16), nullable=False, default="PENDING")  # PENDING/PAID/LATE
 
 
+# Next-due lookups walk a loan's schedule in date order; loan_id leads, so it serves the FK too
+db.Index("ix_repay_loan_due", RepaymentSchedule.loan_id, RepaymentSchedule.due_date)
+
 
 # ---------- Credit Card Applications ----------
 # ---------- Credit Card Applications ----------
@@ -329,17 +453,21 @@ class CreditCardApplication(db.Model):
     requested_limit = db.Column(db.Numeric(14, 2), nullable=True)   # ✅ keep only this one
     approved_limit = db.Column(db.Numeric(14, 2))
     pincode = db.Column(db.String(6))
-    pan_file_path = db.Column(db.String(255))
-    aadhaar_file_path = db.Column(db.String(255))
-    income_proof_file_path = db.Column(db.String(255))
-    status = db.Column(db.Enum(RequestStatus), default=RequestStatus.PENDING, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    pan_file_path = db.Column(db.String(160))
+    aadhaar_file_path = db.Column(db.String(160))
+    income_proof_file_path = db.Column(db.String(160))
+    status = db.Column(_enum_str(RequestStatus, "chk_credit_card_applications_status"), default=RequestStatus.PENDING, nullable=False)
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
 
 
 
 
     # Relationships
-    customer = relationship("Customer", back_populates="credit_card_applications")
+    customer = relationship("Customer", back_populates="credit_card_applications", lazy="raise")
+
+
+db.Index("ix_cc_app_status_created", CreditCardApplication.status, CreditCardApplication.created_at.desc())
+db.Index("ix_cc_app_cust_created", CreditCardApplication.customer_id, CreditCardApplication.created_at.desc())
 
 
 # ---------- Debit Card Applications ----------
@@ -358,13 +486,20 @@ class DebitCardApplication(db.Model):
     requested_limit = db.Column(db.Numeric(14, 2))
     approved_limit = db.Column(db.Numeric(14, 2))
     pincode = db.Column(db.String(6))
-    pan_file_path = db.Column(db.String(255))
-    aadhaar_file_path = db.Column(db.String(255))
-    status = db.Column(db.Enum(RequestStatus), default=RequestStatus.PENDING, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    pan_file_path = db.Column(db.String(160))
+    aadhaar_file_path = db.Column(db.String(160))
+    status = db.Column(_enum_str(RequestStatus, "chk_debit_card_applications_status"), default=RequestStatus.PENDING, nullable=False)
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
 
     # Relationships
-    customer = relationship("Customer", backref="debit_card_applications")
+    customer = relationship("Customer", backref="debit_card_applications", lazy=_LAZY)
+
+
+# Ops lists filter by status, customer lists by customer_id; both page newest-first
+db.Index("ix_dc_status_created", DebitCardApplication.status, DebitCardApplication.created_at.desc(),
+         DebitCardApplication.id.desc())
+db.Index("ix_dc_cust_created", DebitCardApplication.customer_id, DebitCardApplication.created_at.desc(),
+         DebitCardApplication.id.desc())
 
 
 # ---------- SIP (Systematic Investment Plan) ----------
@@ -372,13 +507,13 @@ class SIPApplication(db.Model):
     __tablename__ = "sip_applications"
     
     id = db.Column(MyBigInt(unsigned=True), primary_key=True)
-    customer_id = db.Column(MyBigInt(unsigned=True), db.ForeignKey("customers.id"), nullable=False, index=True)
+    customer_id = db.Column(MyBigInt(unsigned=True), db.ForeignKey("customers.id"), nullable=False)
     account_id = db.Column(MyBigInt(unsigned=True), db.ForeignKey("accounts.id"), nullable=False, index=True)
     
     # SIP Details
     fund_name = db.Column(db.String(120), nullable=False)  # e.g., "Equity Fund", "Debt Fund", "Hybrid Fund"
     fund_type = db.Column(db.String(32), nullable=False)   # EQUITY, DEBT, HYBRID
-    monthly_amount = db.Column(db.Numeric(14, 2), nullable=False)
+    monthly_amount = db.Column(db.BigInteger, nullable=False)  # integer paise
     tenure_months = db.Column(db.Integer, nullable=False)  # SIP duration in months
     start_date = db.Column(db.Date, nullable=False)
     
@@ -386,20 +521,25 @@ class SIPApplication(db.Model):
     expected_return_pa = db.Column(db.Numeric(5, 2), nullable=False)  # Expected return % per annum
     
     # Status and tracking
-    status = db.Column(db.Enum(RequestStatus), default=RequestStatus.PENDING, nullable=False)
-    is_active = db.Column(db.Boolean, default=False, nullable=False)
-    current_value = db.Column(db.Numeric(14, 2), default=0)
-    total_invested = db.Column(db.Numeric(14, 2), default=0)
+    status = db.Column(_enum_str(RequestStatus, "chk_sip_applications_status"), default=RequestStatus.PENDING, nullable=False)
+    is_active = db.Column(db.Boolean, server_default=db.text("0"), nullable=False)
+    current_value = db.Column(db.BigInteger, server_default=db.text("0"))  # integer paise
+    total_invested = db.Column(db.BigInteger, server_default=db.text("0"))  # integer paise
     
     # Documents
-    kyc_file_path = db.Column(db.String(255))
+    kyc_file_path = db.Column(db.String(160))
     
-    created_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
-    updated_at = db.Column(db.DateTime, server_default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
+    updated_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
     
     # Relationships
-    customer = relationship("Customer", backref="sip_applications")
-    account = relationship("Account", backref="sip_applications")
+    customer = relationship("Customer", backref="sip_applications", lazy=_LAZY)
+    account = relationship("Account", backref="sip_applications", lazy=_LAZY)
+
+
+# customer_id leads ix_sip_cust_created, which doubles as the FK index
+db.Index("ix_sip_status_created", SIPApplication.status, SIPApplication.created_at.desc(), SIPApplication.id.desc())
+db.Index("ix_sip_cust_created", SIPApplication.customer_id, SIPApplication.created_at.desc(), SIPApplication.id.desc())
 
 
 class SIPTransaction(db.Model):
@@ -410,19 +550,19 @@ class SIPTransaction(db.Model):
     account_id = db.Column(MyBigInt(unsigned=True), db.ForeignKey("accounts.id"), nullable=False, index=True)
     
     # Transaction details
-    amount = db.Column(db.Numeric(14, 2), nullable=False)
+    amount = db.Column(db.BigInteger, nullable=False)  # integer paise
     transaction_date = db.Column(db.Date, nullable=False)
-    status = db.Column(db.Enum(TxStatus), default=TxStatus.PENDING, nullable=False)
+    status = db.Column(_enum_str(TxStatus, "chk_sip_transactions_status"), default=TxStatus.PENDING, nullable=False)
     
     # Market simulation (for demo purposes)
     nav_at_purchase = db.Column(db.Numeric(8, 4))  # Net Asset Value
     units_purchased = db.Column(db.Numeric(14, 6))
     
-    created_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
     
     # Relationships
-    sip = relationship("SIPApplication", backref="transactions")
-    account = relationship("Account", backref="sip_transactions")
+    sip = relationship("SIPApplication", backref="transactions", lazy=_LAZY)
+    account = relationship("Account", backref="sip_transactions", lazy=_LAZY)
 
 
 # ---------- Sovereign Gold Bonds (SGB) ----------
@@ -430,29 +570,35 @@ class SGBApplication(db.Model):
     __tablename__ = "sgb_applications"
     
     id = db.Column(MyBigInt(unsigned=True), primary_key=True)
-    customer_id = db.Column(MyBigInt(unsigned=True), db.ForeignKey("customers.id"), nullable=False, index=True)
+    customer_id = db.Column(MyBigInt(unsigned=True), db.ForeignKey("customers.id"), nullable=False)
     account_id = db.Column(MyBigInt(unsigned=True), db.ForeignKey("accounts.id"), nullable=False, index=True)
     
     # SGB Details
     series = db.Column(db.String(50), nullable=False)  # e.g., "SGB Series 2024-25"
-    investment_amount = db.Column(db.Numeric(14, 2), nullable=False)
+    investment_amount = db.Column(db.BigInteger, nullable=False)  # integer paise
     units = db.Column(db.Numeric(10, 4), nullable=False)  # Grams of gold
     pan_number = db.Column(db.String(10), nullable=False)  # PAN number
+    pan_hmac = db.Column(db.BINARY(32), index=True)   # pii_hmac(pan_number)
     
     # Current status and tracking
-    status = db.Column(db.Enum(RequestStatus), default=RequestStatus.PENDING, nullable=False)
-    current_value = db.Column(db.Numeric(14, 2), default=0)
-    interest_earned = db.Column(db.Numeric(14, 2), default=0)
+    status = db.Column(_enum_str(RequestStatus, "chk_sgb_applications_status"), default=RequestStatus.PENDING, nullable=False)
+    current_value = db.Column(db.BigInteger, server_default=db.text("0"))  # integer paise
+    interest_earned = db.Column(db.BigInteger, server_default=db.text("0"))  # integer paise
     
     # Documents
-    kyc_file_path = db.Column(db.String(255))
+    kyc_file_path = db.Column(db.String(160))
     
-    created_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
-    updated_at = db.Column(db.DateTime, server_default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
+    updated_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
     
     # Relationships
-    customer = relationship("Customer", backref="sgb_applications")
-    account = relationship("Account", backref="sgb_applications")
+    customer = relationship("Customer", backref="sgb_applications", lazy=_LAZY)
+    account = relationship("Account", backref="sgb_applications", lazy=_LAZY)
+
+
+# customer_id leads ix_sgb_cust_created, which doubles as the FK index
+db.Index("ix_sgb_status_created", SGBApplication.status, SGBApplication.created_at.desc(), SGBApplication.id.desc())
+db.Index("ix_sgb_cust_created", SGBApplication.customer_id, SGBApplication.created_at.desc(), SGBApplication.id.desc())
 
 
 class SGBTransaction(db.Model):
@@ -464,15 +610,15 @@ class SGBTransaction(db.Model):
     
     # Transaction details
     transaction_type = db.Column(db.String(20), nullable=False)  # PURCHASE, INTEREST, MATURITY, EXIT
-    amount = db.Column(db.Numeric(14, 2), nullable=False)
+    amount = db.Column(db.BigInteger, nullable=False)  # integer paise
     transaction_date = db.Column(db.Date, nullable=False)
-    status = db.Column(db.Enum(TxStatus), default=TxStatus.PENDING, nullable=False)
+    status = db.Column(_enum_str(TxStatus, "chk_sgb_transactions_status"), default=TxStatus.PENDING, nullable=False)
     
     # Gold price at transaction
     gold_price_per_gram = db.Column(db.Numeric(10, 2))
     
-    created_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
     
     # Relationships
-    sgb = relationship("SGBApplication", backref="transactions")
-    account = relationship("Account", backref="sgb_transactions")
+    sgb = relationship("SGBApplication", backref="transactions", lazy=_LAZY)
+    account = relationship("Account", backref="sgb_transactions", lazy=_LAZY)
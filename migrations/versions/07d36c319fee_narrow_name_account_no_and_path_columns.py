@@ -0,0 +1,64 @@
+"""narrow full name, account number and upload path columns
+
+Revision ID: 07d36c319fee
+Revises: bb60e77a4f54
+Create Date: 2026-10-15 18:55:39.402716
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '07d36c319fee'
+down_revision = 'bb60e77a4f54'
+branch_labels = None
+depends_on = None
+
+# (table, column, old length, new length, nullable)
+COLUMNS = [
+    ('customers', 'full_name', 160, 120, False),
+    ('accounts', 'account_no', 32, 20, False),
+    ('account_requests', 'aadhaar_file_path', 255, 160, True),
+    ('account_requests', 'pan_file_path', 255, 160, True),
+    ('account_requests', 'photo_file_path', 255, 160, True),
+    ('loan_application_docs', 'file_path', 255, 160, False),
+    ('credit_card_applications', 'pan_file_path', 255, 160, True),
+    ('credit_card_applications', 'aadhaar_file_path', 255, 160, True),
+    ('credit_card_applications', 'income_proof_file_path', 255, 160, True),
+    ('debit_card_applications', 'pan_file_path', 255, 160, True),
+    ('debit_card_applications', 'aadhaar_file_path', 255, 160, True),
+    ('sip_applications', 'kyc_file_path', 255, 160, True),
+    ('sgb_applications', 'kyc_file_path', 255, 160, True),
+]
+
+
+def upgrade():
+    # Strict mode would reject the ALTER halfway through (non-strict would
+    # silently truncate), so refuse up front and name every offending column.
+    # --sql output cannot look at the data; run these checks by hand first.
+    if not context.is_offline_mode():
+        bind = op.get_bind()
+        too_long = []
+        for table, column, _, length, _ in COLUMNS:
+            col = sa.column(column)
+            n = bind.execute(sa.select(sa.func.count()).select_from(sa.table(table, col))
+                             .where(sa.func.char_length(col) > length)).scalar()
+            if n:
+                too_long.append(f"{table}.{column}: {n} row(s) over {length}")
+        if too_long:
+            raise RuntimeError("Values too long to narrow; shorten them and re-run:\n  " + "\n  ".join(too_long))
+
+    for table, column, old, new, nullable in COLUMNS:
+        op.alter_column(table, column,
+                        existing_type=sa.String(length=old),
+                        type_=sa.String(length=new),
+                        existing_nullable=nullable)
+
+
+def downgrade():
+    for table, column, old, new, nullable in reversed(COLUMNS):
+        op.alter_column(table, column,
+                        existing_type=sa.String(length=new),
+                        type_=sa.String(length=old),
+                        existing_nullable=nullable)
@@ -0,0 +1,61 @@
+"""PAN/Aadhaar HMAC lookup columns
+
+Revision ID: 0ea158e2a4ac
+Revises: 69c5c8dbc25e
+Create Date: 2026-10-15 19:12:45.381627
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+from database.models import pii_hmac
+
+
+# revision identifiers, used by Alembic.
+revision = '0ea158e2a4ac'
+down_revision = '69c5c8dbc25e'
+branch_labels = None
+depends_on = None
+
+# table -> [(digest column, source column)]
+DIGESTS = {
+    'account_requests': [('aadhaar_hmac', 'aadhaar_no'), ('pan_hmac', 'pan_no')],
+    'loan_applications': [('pan_hmac', 'pan_num'), ('aadhaar_hmac', 'aadhaar_no')],
+    'sgb_applications': [('pan_hmac', 'pan_number')],
+}
+
+
+def _backfill(table, pairs):
+    t = sa.table(table, sa.column('id'), *(sa.column(c) for pair in pairs for c in pair))
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(t.c.id, *(t.c[src] for _, src in pairs))).all()
+    if not rows:
+        return
+    stmt = (t.update().where(t.c.id == sa.bindparam('_id'))
+            .values({digest: sa.bindparam(digest) for digest, _ in pairs}))
+    bind.execute(stmt, [
+        {'_id': row.id, **{digest: pii_hmac(row._mapping[src]) for digest, src in pairs}}
+        for row in rows
+    ])
+
+
+def upgrade():
+    for table, pairs in DIGESTS.items():
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            for digest, _ in pairs:
+                batch_op.add_column(sa.Column(digest, sa.BINARY(length=32), nullable=True))
+                batch_op.create_index(batch_op.f(f'ix_{table}_{digest}'), [digest], unique=False)
+
+    # MySQL has no HMAC function, so existing rows are digested here with the
+    # app's PII_HMAC_KEY. --sql output cannot do this; run the upgrade online.
+    if not context.is_offline_mode():
+        for table, pairs in DIGESTS.items():
+            _backfill(table, pairs)
+
+
+def downgrade():
+    for table, pairs in reversed(list(DIGESTS.items())):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            for digest, _ in reversed(pairs):
+                batch_op.drop_index(batch_op.f(f'ix_{table}_{digest}'))
+                batch_op.drop_column(digest)
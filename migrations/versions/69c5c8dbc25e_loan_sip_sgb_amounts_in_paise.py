@@ -0,0 +1,59 @@
+"""loan, repayment, SIP and SGB amounts in paise
+
+Revision ID: 69c5c8dbc25e
+Revises: 9497159f84e2
+Create Date: 2026-10-15 19:08:17.659104
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '69c5c8dbc25e'
+down_revision = '9497159f84e2'
+branch_labels = None
+depends_on = None
+
+ZERO = sa.text('0')
+
+# (table, column, nullable, server default); all were Numeric(14, 2)
+COLUMNS = [
+    ('loan_applications', 'amount', False, None),
+    ('loans', 'principal', False, None),
+    ('repayment_schedule', 'emi', False, None),
+    ('repayment_schedule', 'principal_part', False, None),
+    ('repayment_schedule', 'interest_part', False, None),
+    ('sip_applications', 'monthly_amount', False, None),
+    ('sip_applications', 'current_value', True, ZERO),
+    ('sip_applications', 'total_invested', True, ZERO),
+    ('sip_transactions', 'amount', False, None),
+    ('sgb_applications', 'investment_amount', False, None),
+    ('sgb_applications', 'current_value', True, ZERO),
+    ('sgb_applications', 'interest_earned', True, ZERO),
+    ('sgb_transactions', 'amount', False, None),
+]
+
+
+def _retype(table, column, nullable, default, old, new):
+    op.alter_column(table, column,
+                    existing_type=old,
+                    type_=new,
+                    existing_server_default=default,
+                    existing_nullable=nullable)
+
+
+def upgrade():
+    # Same steps as the ledger: widen so x100 fits, scale, then BIGINT takes
+    # the whole numbers as-is, all in this one revision.
+    for table, column, nullable, default in COLUMNS:
+        _retype(table, column, nullable, default, sa.Numeric(precision=14, scale=2), sa.Numeric(precision=16, scale=2))
+        op.execute(f"UPDATE {table} SET {column} = {column} * 100")
+        _retype(table, column, nullable, default, sa.Numeric(precision=16, scale=2), sa.BigInteger())
+
+
+def downgrade():
+    for table, column, nullable, default in reversed(COLUMNS):
+        _retype(table, column, nullable, default, sa.BigInteger(), sa.Numeric(precision=16, scale=2))
+        op.execute(f"UPDATE {table} SET {column} = {column} / 100")
+        _retype(table, column, nullable, default, sa.Numeric(precision=16, scale=2), sa.Numeric(precision=14, scale=2))
@@ -0,0 +1,45 @@
+"""SIP/SGB zero defaults and loan start date default
+
+Revision ID: 6be69f057976
+Revises: 07d36c319fee
+Create Date: 2026-10-15 18:59:26.518843
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6be69f057976'
+down_revision = '07d36c319fee'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('sip_applications', schema=None) as batch_op:
+        batch_op.alter_column('is_active', existing_type=sa.Boolean(), server_default=sa.text('0'), existing_nullable=False)
+        batch_op.alter_column('current_value', existing_type=sa.Numeric(precision=14, scale=2), server_default=sa.text('0'), existing_nullable=True)
+        batch_op.alter_column('total_invested', existing_type=sa.Numeric(precision=14, scale=2), server_default=sa.text('0'), existing_nullable=True)
+
+    with op.batch_alter_table('sgb_applications', schema=None) as batch_op:
+        batch_op.alter_column('current_value', existing_type=sa.Numeric(precision=14, scale=2), server_default=sa.text('0'), existing_nullable=True)
+        batch_op.alter_column('interest_earned', existing_type=sa.Numeric(precision=14, scale=2), server_default=sa.text('0'), existing_nullable=True)
+
+    # Expression default (MySQL 8.0.13+); type_ makes it a full MODIFY, which takes one
+    with op.batch_alter_table('loans', schema=None) as batch_op:
+        batch_op.alter_column('start_date', existing_type=sa.Date(), type_=sa.Date(), server_default=sa.text('(CURRENT_DATE)'), existing_nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('loans', schema=None) as batch_op:
+        batch_op.alter_column('start_date', existing_type=sa.Date(), server_default=None, existing_nullable=False)
+
+    with op.batch_alter_table('sgb_applications', schema=None) as batch_op:
+        batch_op.alter_column('interest_earned', existing_type=sa.Numeric(precision=14, scale=2), server_default=None, existing_nullable=True)
+        batch_op.alter_column('current_value', existing_type=sa.Numeric(precision=14, scale=2), server_default=None, existing_nullable=True)
+
+    with op.batch_alter_table('sip_applications', schema=None) as batch_op:
+        batch_op.alter_column('total_invested', existing_type=sa.Numeric(precision=14, scale=2), server_default=None, existing_nullable=True)
+        batch_op.alter_column('current_value', existing_type=sa.Numeric(precision=14, scale=2), server_default=None, existing_nullable=True)
+        batch_op.alter_column('is_active', existing_type=sa.Boolean(), server_default=None, existing_nullable=False)
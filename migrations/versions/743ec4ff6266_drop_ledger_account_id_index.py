@@ -0,0 +1,25 @@
+"""drop single-column ledger account_id index
+
+Revision ID: 743ec4ff6266
+Revises: fd1ab9aa57ca
+Create Date: 2026-10-15 18:36:20.581934
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '743ec4ff6266'
+down_revision = 'fd1ab9aa57ca'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ix_ledger_acct_drcr_amt / ix_ledger_acct_posted_id lead with account_id and back the foreign key
+    op.drop_index('ix_ledger_entries_account_id', table_name='ledger_entries')
+
+
+def downgrade():
+    op.create_index('ix_ledger_entries_account_id', 'ledger_entries', ['account_id'], unique=False)
@@ -0,0 +1,24 @@
+"""account request queue index
+
+Revision ID: 780908fc5aa5
+Revises: 0ea158e2a4ac
+Create Date: 2026-10-15 19:16:08.927451
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '780908fc5aa5'
+down_revision = '0ea158e2a4ac'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_acct_req_status_created', 'account_requests', ['status', sa.literal_column('created_at DESC'), sa.literal_column('id DESC')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_acct_req_status_created', table_name='account_requests')
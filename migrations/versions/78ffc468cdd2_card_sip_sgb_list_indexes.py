@@ -0,0 +1,39 @@
+"""debit card, SIP and SGB list indexes
+
+Revision ID: 78ffc468cdd2
+Revises: ad3d1caef3b8
+Create Date: 2026-10-15 18:43:02.774519
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '78ffc468cdd2'
+down_revision = 'ad3d1caef3b8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_dc_status_created', 'debit_card_applications', ['status', sa.literal_column('created_at DESC'), sa.literal_column('id DESC')], unique=False)
+    op.create_index('ix_dc_cust_created', 'debit_card_applications', ['customer_id', sa.literal_column('created_at DESC'), sa.literal_column('id DESC')], unique=False)
+    op.create_index('ix_sip_status_created', 'sip_applications', ['status', sa.literal_column('created_at DESC'), sa.literal_column('id DESC')], unique=False)
+    op.create_index('ix_sip_cust_created', 'sip_applications', ['customer_id', sa.literal_column('created_at DESC'), sa.literal_column('id DESC')], unique=False)
+    op.create_index('ix_sgb_status_created', 'sgb_applications', ['status', sa.literal_column('created_at DESC'), sa.literal_column('id DESC')], unique=False)
+    op.create_index('ix_sgb_cust_created', 'sgb_applications', ['customer_id', sa.literal_column('created_at DESC'), sa.literal_column('id DESC')], unique=False)
+    # The *_cust_created indexes lead with customer_id and now back the foreign keys
+    op.drop_index('ix_sip_applications_customer_id', table_name='sip_applications')
+    op.drop_index('ix_sgb_applications_customer_id', table_name='sgb_applications')
+
+
+def downgrade():
+    op.create_index('ix_sgb_applications_customer_id', 'sgb_applications', ['customer_id'], unique=False)
+    op.create_index('ix_sip_applications_customer_id', 'sip_applications', ['customer_id'], unique=False)
+    op.drop_index('ix_sgb_cust_created', table_name='sgb_applications')
+    op.drop_index('ix_sgb_status_created', table_name='sgb_applications')
+    op.drop_index('ix_sip_cust_created', table_name='sip_applications')
+    op.drop_index('ix_sip_status_created', table_name='sip_applications')
+    op.drop_index('ix_dc_cust_created', table_name='debit_card_applications')
+    op.drop_index('ix_dc_status_created', table_name='debit_card_applications')
@@ -0,0 +1,24 @@
+"""ledger statement keyset index
+
+Revision ID: 7f88df66d5a1
+Revises: 92af6fcdc79c
+Create Date: 2026-10-15 18:29:55.317640
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7f88df66d5a1'
+down_revision = '92af6fcdc79c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_ledger_acct_posted_id', 'ledger_entries', ['account_id', sa.literal_column('posted_at DESC'), sa.literal_column('id DESC')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_ledger_acct_posted_id', table_name='ledger_entries')
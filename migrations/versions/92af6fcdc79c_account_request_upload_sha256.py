@@ -0,0 +1,31 @@
+"""account request upload SHA-256 columns
+
+Revision ID: 92af6fcdc79c
+Revises: d3df8903466e
+Create Date: 2026-10-15 18:27:12.840395
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '92af6fcdc79c'
+down_revision = 'd3df8903466e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Files uploaded before this revision have no digest and stay NULL
+    with op.batch_alter_table('account_requests', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('aadhaar_sha256', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('pan_sha256', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('photo_sha256', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('account_requests', schema=None) as batch_op:
+        batch_op.drop_column('photo_sha256')
+        batch_op.drop_column('pan_sha256')
+        batch_op.drop_column('aadhaar_sha256')
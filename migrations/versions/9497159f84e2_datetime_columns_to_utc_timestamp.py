@@ -0,0 +1,86 @@
+"""DATETIME columns to UTC TIMESTAMP
+
+Revision ID: 9497159f84e2
+Revises: 6be69f057976
+Create Date: 2026-10-15 19:03:52.270938
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9497159f84e2'
+down_revision = '6be69f057976'
+branch_labels = None
+depends_on = None
+
+NOW = sa.text('CURRENT_TIMESTAMP')
+
+# Filled by the server's CURRENT_TIMESTAMP, i.e. wall-clock time in the server's zone
+SERVER_FILLED = [
+    ('users', 'created_at'),
+    ('customers', 'created_at'),
+    ('transactions', 'created_at'),
+    ('account_requests', 'created_at'),
+    ('accounts', 'created_at'),
+    ('loan_applications', 'created_at'),
+    ('internet_banking', 'created_at'),
+    ('ledger_entries', 'posted_at'),
+    ('loan_app_history', 'created_at'),
+    ('loan_application_details', 'created_at'),
+    ('loan_application_details', 'updated_at'),
+    ('loan_application_docs', 'uploaded_at'),
+    ('sip_applications', 'created_at'),
+    ('sip_applications', 'updated_at'),
+    ('sgb_applications', 'created_at'),
+    ('sgb_applications', 'updated_at'),
+    ('sip_transactions', 'created_at'),
+    ('sgb_transactions', 'created_at'),
+]
+
+# Filled by Python's datetime.utcnow() and without a server default until now
+APP_FILLED_UTC = [
+    ('credit_card_applications', 'created_at'),
+    ('debit_card_applications', 'created_at'),
+]
+
+
+def upgrade():
+    # MODIFY to TIMESTAMP reads each DATETIME as local time in the session
+    # zone and stores it as UTC. The app's connections pin '+00:00', so put the
+    # zone the values were actually written in back for each group.
+    op.execute("SET time_zone = @@global.time_zone")
+    for table, column in SERVER_FILLED:
+        op.alter_column(table, column,
+                        existing_type=sa.DateTime(),
+                        type_=sa.TIMESTAMP(),
+                        existing_server_default=NOW,
+                        existing_nullable=True)
+
+    op.execute("SET time_zone = '+00:00'")
+    for table, column in APP_FILLED_UTC:
+        op.alter_column(table, column,
+                        existing_type=sa.DateTime(),
+                        type_=sa.TIMESTAMP(),
+                        server_default=NOW,
+                        existing_nullable=True)
+
+
+def downgrade():
+    op.execute("SET time_zone = '+00:00'")
+    for table, column in reversed(APP_FILLED_UTC):
+        op.alter_column(table, column,
+                        existing_type=sa.TIMESTAMP(),
+                        type_=sa.DateTime(),
+                        server_default=None,
+                        existing_nullable=True)
+
+    op.execute("SET time_zone = @@global.time_zone")
+    for table, column in reversed(SERVER_FILLED):
+        op.alter_column(table, column,
+                        existing_type=sa.TIMESTAMP(),
+                        type_=sa.DateTime(),
+                        existing_server_default=NOW,
+                        existing_nullable=True)
+    op.execute("SET time_zone = '+00:00'")
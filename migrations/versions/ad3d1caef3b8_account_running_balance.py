@@ -0,0 +1,33 @@
+"""account running balance
+
+Revision ID: ad3d1caef3b8
+Revises: 743ec4ff6266
+Create Date: 2026-10-15 18:39:47.226105
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ad3d1caef3b8'
+down_revision = '743ec4ff6266'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('accounts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('balance', sa.BigInteger(), server_default='0', nullable=False))
+
+    # Seed from the ledger (already in paise); `flask reconcile-balances` checks it afterwards
+    op.execute(
+        "UPDATE accounts SET balance = COALESCE(("
+        "SELECT SUM(CASE WHEN l.dr_cr = 'CR' THEN l.amount ELSE -l.amount END) "
+        "FROM ledger_entries l WHERE l.account_id = accounts.id), 0)"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('accounts', schema=None) as batch_op:
+        batch_op.drop_column('balance')
@@ -0,0 +1,37 @@
+"""loan, credit card and repayment schedule indexes
+
+Revision ID: ae09e227b64d
+Revises: 78ffc468cdd2
+Create Date: 2026-10-15 18:46:31.095382
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ae09e227b64d'
+down_revision = '78ffc468cdd2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_loan_app_status_created', 'loan_applications', ['status', sa.literal_column('created_at DESC')], unique=False)
+    op.create_index('ix_loan_app_cust_created', 'loan_applications', ['customer_id', sa.literal_column('created_at DESC')], unique=False)
+    op.create_index('ix_cc_app_status_created', 'credit_card_applications', ['status', sa.literal_column('created_at DESC')], unique=False)
+    op.create_index('ix_cc_app_cust_created', 'credit_card_applications', ['customer_id', sa.literal_column('created_at DESC')], unique=False)
+    op.create_index('ix_repay_loan_due', 'repayment_schedule', ['loan_id', 'due_date'], unique=False)
+    # Superseded by the composites above, which lead with the same foreign key column
+    op.drop_index('ix_loan_applications_customer_id', table_name='loan_applications')
+    op.drop_index('ix_repayment_schedule_loan_id', table_name='repayment_schedule')
+
+
+def downgrade():
+    op.create_index('ix_repayment_schedule_loan_id', 'repayment_schedule', ['loan_id'], unique=False)
+    op.create_index('ix_loan_applications_customer_id', 'loan_applications', ['customer_id'], unique=False)
+    op.drop_index('ix_repay_loan_due', table_name='repayment_schedule')
+    op.drop_index('ix_cc_app_cust_created', table_name='credit_card_applications')
+    op.drop_index('ix_cc_app_status_created', table_name='credit_card_applications')
+    op.drop_index('ix_loan_app_cust_created', table_name='loan_applications')
+    op.drop_index('ix_loan_app_status_created', table_name='loan_applications')
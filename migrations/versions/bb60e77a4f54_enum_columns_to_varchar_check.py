@@ -0,0 +1,60 @@
+"""enum columns to VARCHAR + CHECK
+
+Revision ID: bb60e77a4f54
+Revises: ae09e227b64d
+Create Date: 2026-10-15 18:51:14.638820
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'bb60e77a4f54'
+down_revision = 'ae09e227b64d'
+branch_labels = None
+depends_on = None
+
+KYC = ('PENDING', 'VERIFIED', 'REJECTED')
+REQUEST = ('PENDING', 'APPROVED', 'REJECTED')
+ACCOUNT = ('APPROVAL_PENDING', 'ACTIVE', 'FROZEN')
+TX_TYPE = ('DEPOSIT', 'TRANSFER', 'LOAN_DISBURSAL', 'EMI_PAYMENT')
+TX_STATUS = ('PENDING', 'POSTED', 'FAILED')
+LOAN = ('ACTIVE', 'CLOSED', 'DEFAULT')
+
+# (table, column, allowed values, MySQL ENUM name it replaces); all NOT NULL
+COLUMNS = [
+    ('customers', 'kyc_status', KYC, 'kycstatus'),
+    ('account_requests', 'status', REQUEST, 'requeststatus'),
+    ('accounts', 'status', ACCOUNT, 'accountstatus'),
+    ('transactions', 'type', TX_TYPE, 'txtype'),
+    ('transactions', 'status', TX_STATUS, 'txstatus'),
+    ('loan_applications', 'status', REQUEST, 'requeststatus'),
+    ('loans', 'status', LOAN, 'loanstatus'),
+    ('credit_card_applications', 'status', REQUEST, 'requeststatus'),
+    ('debit_card_applications', 'status', REQUEST, 'requeststatus'),
+    ('sip_applications', 'status', REQUEST, 'requeststatus'),
+    ('sip_transactions', 'status', TX_STATUS, 'txstatus'),
+    ('sgb_applications', 'status', REQUEST, 'requeststatus'),
+    ('sgb_transactions', 'status', TX_STATUS, 'txstatus'),
+]
+
+
+def upgrade():
+    # Adding a value later is a CHECK swap rather than a column type change
+    for table, column, values, enum_name in COLUMNS:
+        op.alter_column(table, column,
+                        existing_type=sa.Enum(*values, name=enum_name),
+                        type_=sa.String(length=24),
+                        existing_nullable=False)
+        allowed = ", ".join(f"'{v}'" for v in values)
+        op.create_check_constraint(f'chk_{table}_{column}', table, f"{column} IN ({allowed})")
+
+
+def downgrade():
+    for table, column, values, enum_name in reversed(COLUMNS):
+        op.drop_constraint(f'chk_{table}_{column}', table, type_='check')
+        op.alter_column(table, column,
+                        existing_type=sa.String(length=24),
+                        type_=sa.Enum(*values, name=enum_name),
+                        existing_nullable=False)
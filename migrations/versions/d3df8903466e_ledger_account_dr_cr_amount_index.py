@@ -0,0 +1,25 @@
+"""ledger (account_id, dr_cr, amount) index
+
+Revision ID: d3df8903466e
+Revises: 868e7dfc094b
+Create Date: 2026-10-15 18:24:41.502217
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3df8903466e'
+down_revision = '868e7dfc094b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Covers the conditional balance SUM, so it never touches the table rows
+    op.create_index('ix_ledger_acct_drcr_amt', 'ledger_entries', ['account_id', 'dr_cr', 'amount'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_ledger_acct_drcr_amt', table_name='ledger_entries')
@@ -0,0 +1,43 @@
+"""ledger amount in paise
+
+Revision ID: fd1ab9aa57ca
+Revises: 7f88df66d5a1
+Create Date: 2026-10-15 18:33:08.964021
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'fd1ab9aa57ca'
+down_revision = '7f88df66d5a1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rupees -> paise in the same revision as the type change, so no deployed
+    # code ever reads one unit out of the other. Widen first so the x100 fits,
+    # then the values are whole numbers and BIGINT takes them as-is.
+    op.alter_column('ledger_entries', 'amount',
+                    existing_type=sa.Numeric(precision=14, scale=2),
+                    type_=sa.Numeric(precision=16, scale=2),
+                    existing_nullable=False)
+    op.execute("UPDATE ledger_entries SET amount = amount * 100")
+    op.alter_column('ledger_entries', 'amount',
+                    existing_type=sa.Numeric(precision=16, scale=2),
+                    type_=sa.BigInteger(),
+                    existing_nullable=False)
+
+
+def downgrade():
+    op.alter_column('ledger_entries', 'amount',
+                    existing_type=sa.BigInteger(),
+                    type_=sa.Numeric(precision=16, scale=2),
+                    existing_nullable=False)
+    op.execute("UPDATE ledger_entries SET amount = amount / 100")
+    op.alter_column('ledger_entries', 'amount',
+                    existing_type=sa.Numeric(precision=16, scale=2),
+                    type_=sa.Numeric(precision=14, scale=2),
+                    existing_nullable=False)
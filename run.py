@@ -1,4 +1,9 @@
+import os
 from backend import create_app
+
+if __name__ == "__main__":
+    # Debug has to be known before create_app() (it picks the dev PII_HMAC_KEY)
+    os.environ.setdefault("FLASK_DEBUG", "1")
 app = create_app()
 
 if __name__ == "__main__":
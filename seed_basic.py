@@ -1,52 +1,67 @@
 # seed_basic.py
+from sqlalchemy.pool import NullPool
 from backend import create_app
 from database.models import db, Role, User, UserRole, Branch, AccountNumberSeq
 
-app = create_app()
+# A one-shot script: open a single connection and close it on exit, no pool to linger
+app = create_app(engine_options={"poolclass": NullPool})
 
-def ensure_role(name: str) -> Role:
-    r = Role.query.filter_by(name=name).first()
-    if not r:
-        r = Role(name=name)
-        db.session.add(r)
-        db.session.commit()
-    return r
+ROLES = ["CUSTOMER", "EMPLOYEE", "ADMIN"]
+BRANCHES = [
+    # code, name, ifsc, address
+    ("B001", "Main Branch", "YBKL0001", "Head Office"),
+    ("B002", "City Branch", "YBKL0002", "City Center"),
+]
+EMPLOYEES = [
+    # email, first, last, password
+    ("employee@yourbank.local", "Bank", "Employee", "1234"),
+]
 
-def ensure_branch(code: str, name: str, ifsc: str, address: str) -> Branch:
-    b = Branch.query.filter_by(code=code).first()
-    if not b:
-        b = Branch(code=code, name=name, ifsc=ifsc, address=address)
-        db.session.add(b)
-        db.session.commit()
-    if not AccountNumberSeq.query.filter_by(branch_id=b.id).first():
-        db.session.add(AccountNumberSeq(branch_id=b.id, next_serial=1000000001))
-        db.session.commit()
-    return b
+def seed() -> None:
+    """Insert whatever is missing in one pass: a SELECT per table, bulk inserts, one commit."""
+    # Roles
+    role_ids = dict(db.session.query(Role.name, Role.id).all())
+    new_roles = [{"name": n} for n in ROLES if n not in role_ids]
+    if new_roles:
+        db.session.bulk_insert_mappings(Role, new_roles, return_defaults=True)
+        role_ids.update((r["name"], r["id"]) for r in new_roles)
 
-def ensure_employee(email: str, first: str, last: str, password: str) -> User:
-    u = User.query.filter_by(email=email).first()
-    if not u:
-        u = User(first_name=first, last_name=last, email=email)
-        u.set_password(password)
-        db.session.add(u)
-        db.session.commit()
-    emp_role = ensure_role("EMPLOYEE")
-    if not UserRole.query.filter_by(user_id=u.id, role_id=emp_role.id).first():
-        db.session.add(UserRole(user_id=u.id, role_id=emp_role.id))
-        db.session.commit()
-    return u
+    # Branches + number sequences
+    branch_ids = dict(db.session.query(Branch.code, Branch.id).all())
+    new_branches = [dict(code=c, name=n, ifsc=i, address=a) for c, n, i, a in BRANCHES if c not in branch_ids]
+    if new_branches:
+        db.session.bulk_insert_mappings(Branch, new_branches, return_defaults=True)
+        branch_ids.update((b["code"], b["id"]) for b in new_branches)
+    seeded = {b for (b,) in db.session.query(AccountNumberSeq.branch_id)}
+    db.session.bulk_insert_mappings(AccountNumberSeq, [
+        {"branch_id": b_id, "next_serial": AccountNumberSeq.START}
+        for b_id in branch_ids.values() if b_id not in seeded
+    ])
 
-if __name__ == "__main__":
-    with app.app_context():
-        # Roles
-        for r in ["CUSTOMER", "EMPLOYEE", "ADMIN"]:
-            ensure_role(r)
-
-        # Branches + number sequences
-        ensure_branch("B001", "Main Branch", "YBKL0001", "Head Office")
-        ensure_branch("B002", "City Branch", "YBKL0002", "City Center")
+    # Default EMPLOYEE users
+    user_ids = dict(db.session.query(User.email, User.id)
+                    .filter(User.email.in_([e[0] for e in EMPLOYEES])))
+    new_users = []
+    for email, first, last, password in EMPLOYEES:
+        if email not in user_ids:
+            user = User(first_name=first, last_name=last, email=email)
+            user.set_password(password)
+            new_users.append(user)
+    if new_users:
+        db.session.add_all(new_users)
+        db.session.flush()
+        user_ids.update((u.email, u.id) for u in new_users)
+    emp_role_id = role_ids["EMPLOYEE"]
+    linked = {u for (u,) in db.session.query(UserRole.user_id)
+              .filter(UserRole.role_id == emp_role_id, UserRole.user_id.in_(user_ids.values()))}
+    db.session.bulk_insert_mappings(UserRole, [
+        {"user_id": u_id, "role_id": emp_role_id}
+        for u_id in user_ids.values() if u_id not in linked
+    ])
 
-        # One default EMPLOYEE user
-        ensure_employee("employee@yourbank.local", "Bank", "Employee", "1234")
+    db.session.commit()
 
-        print("✅ Seeding done: roles, branches, account_number_seq, employee user.")
+if __name__ == "__main__":
+    with app.app_context():
+        seed()
+        print("✅ Seeding done: roles, branches, account_number_seq, employee users.")